@@ -0,0 +1,124 @@
+import json
+import re
+from urllib.parse import urlsplit, urljoin
+
+import requests
+
+from probe_common import host_of, map_by_host
+
+API_COLUMNS = ["api_endpoints", "api_candidates_tested"]
+
+# Quoted urls or paths in the html / inline scripts that look like XHR endpoints
+CANDIDATE_PATTERNS = [
+    re.compile(r'''["']([^"'\s<>]+\.json(?:\?[^"'\s<>]*)?)["']''', re.IGNORECASE),   # busquedas.json on gob.pe
+    re.compile(r'''["']([^"'\s<>]*/api/[^"'\s<>]*)["']''', re.IGNORECASE),           # /api/v2/Rows on mom.gov.sg
+    re.compile(r'''["']([^"'\s<>]*/wp-json/[^"'\s<>]*)["']''', re.IGNORECASE),       # WordPress REST
+    re.compile(r'''["']([^"'\s<>]*/_api/[^"'\s<>]*)["']''', re.IGNORECASE),          # SharePoint REST
+    re.compile(r'''["']([^"'\s<>]*[?&]format=json[^"'\s<>]*)["']''', re.IGNORECASE),  # Joomla
+]
+
+API_HEADERS = {
+    'accept': 'application/json, text/javascript, */*; q=0.01',
+    'x-requested-with': 'XMLHttpRequest',
+    'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
+}
+
+
+def _same_site(url, page_url):
+    host = host_of(url)
+    site = host_of(page_url).removeprefix('www.')
+    return host == site or host.endswith('.' + site)
+
+
+def find_api_candidates(html, page_url):
+    """
+    Likely JSON/XHR endpoints referenced by a page, plus the standard REST roots
+    of the CMS the page seems to run on. Same-site urls only, in discovery order.
+    """
+    candidates = []
+    for pattern in CANDIDATE_PATTERNS:
+        for match in pattern.findall(html):
+            candidates.append(urljoin(page_url, match.replace('\\/', '/')))
+
+    lowered = html.lower()
+    origin = '{0.scheme}://{0.netloc}'.format(urlsplit(page_url))
+    if 'wp-content' in lowered or 'api.w.org' in lowered:
+        candidates.append(origin + '/wp-json/wp/v2/posts?per_page=1')
+    if '_layouts/15' in lowered or 'sharepoint' in lowered:
+        candidates.append(origin + '/_api/web/lists')
+    if 'joomla' in lowered or '/media/jui/' in lowered:
+        candidates.append(page_url + ('&' if '?' in page_url else '?') + 'format=json')
+
+    unique = []
+    for candidate in candidates:
+        if candidate not in unique and _same_site(candidate, page_url):
+            unique.append(candidate)
+    return unique
+
+
+def test_endpoint(url, session, timeout=10):
+    """
+    One cheap call to a candidate endpoint. Returns a description when the answer
+    is structured JSON, otherwise None.
+    """
+    try:
+        response = session.get(url, headers=API_HEADERS, timeout=timeout)
+    except requests.exceptions.RequestException as e:
+        print(f"Error testing endpoint {url}: {e}")
+        return None
+    if response.status_code != 200:
+        return None
+    try:
+        data = json.loads(response.content)
+    except ValueError:
+        return None
+    if not isinstance(data, (dict, list)):
+        return None
+    keys = list(data)[:5] if isinstance(data, dict) else [f"list[{len(data)}]"]
+    return {
+        'url': url,
+        'content_type': response.headers.get('Content-Type', 'Unknown'),
+        'size': len(response.content),
+        'top_level': keys,
+    }
+
+
+def detect_api_endpoints(page_url, session=None, max_tests=8, timeout=10):
+    """
+    Fetch a page, collect its candidate endpoints and test up to max_tests of them.
+    Returns (structured endpoints found, number of candidates tested).
+    """
+    session = session or requests.Session()
+    try:
+        response = session.get(page_url, timeout=timeout)
+    except requests.exceptions.RequestException as e:
+        print(f"Error accessing URL {page_url}: {e}")
+        return [], 0
+    candidates = find_api_candidates(response.text, response.url)[:max_tests]
+    found = []
+    for candidate in candidates:
+        endpoint = test_endpoint(candidate, session, timeout)
+        if endpoint is not None:
+            print(f"API endpoint found: {candidate}")
+            found.append(endpoint)
+    return found, len(candidates)
+
+
+def add_api_detection(results, max_workers=16, max_tests=8):
+    """
+    Add the detected API endpoints ('|' separated) next to each check_url result.
+    Hosts are probed in parallel, the sites of one host one after another.
+    """
+    def detect(result):
+        if result["status_code"] == "Error":
+            return None, None
+        return detect_api_endpoints(result["url"], max_tests=max_tests)
+
+    detections = map_by_host(detect, results, url_of=lambda result: result["url"], max_workers=max_workers)
+    for result, (found, tested) in zip(results, detections):
+        if found is None:
+            result.update(dict.fromkeys(API_COLUMNS))
+            continue
+        result["api_endpoints"] = '|'.join(endpoint['url'] for endpoint in found) or 'N/A'
+        result["api_candidates_tested"] = tested
+    return results
@@ -0,0 +1,115 @@
+import asyncio
+import time
+
+import aiohttp
+
+from probe_cache import body_hash
+from probe_common import (
+    BodyPrefix, build_result, declared_content_length, decode_body, detect_anti_bot, error_result, host_of,
+    print_probe_summary,
+)
+
+
+class HostLimiter:
+    """
+    Global cap on probes in flight plus a smaller cap per host, so one slow site
+    can't hold every slot and no site gets more than a few parallel hits.
+    """
+
+    def __init__(self, max_concurrency=200, per_host=4):
+        self.global_slots = asyncio.Semaphore(max_concurrency)
+        self.per_host = per_host
+        self.host_slots = {}
+
+    def for_host(self, host):
+        if host not in self.host_slots:
+            self.host_slots[host] = asyncio.Semaphore(self.per_host)
+        return self.host_slots[host]
+
+
+async def check_url_async(session, url, limiter, max_body_bytes=None, cache=None):
+    entry, request_headers = None, {}
+    if cache is not None:
+        entry, fresh_result, request_headers = cache.lookup(url)
+        if fresh_result is not None:
+            print(f"Cached URL: {url}")
+            return fresh_result
+
+    host_slot = limiter.for_host(host_of(url))
+    async with host_slot, limiter.global_slots:
+        try:
+            print(f"Checking URL: {url}")
+            start_time = time.time()
+            async with session.get(url, headers=request_headers) as response:
+                headers = response.headers
+                if max_body_bytes is None:
+                    body_bytes = await response.read()
+                    text = decode_body(body_bytes, response.charset)
+                    content_length = len(body_bytes)
+                else:
+                    body = BodyPrefix(max_body_bytes, declared_content_length(headers))
+                    async for chunk in response.content.iter_chunked(16 * 1024):
+                        if not body.feed(chunk):
+                            break
+                    body_bytes = bytes(body.prefix)
+                    text = body.text(response.charset)
+                    content_length = body.content_length
+                elapsed_time = time.time() - start_time
+
+                if response.status == 304 and entry is not None:
+                    print(f"Not modified: {url}")
+                    return cache.not_modified(url, entry, elapsed_time)
+
+                anti_bot_signs = detect_anti_bot(str(response.url), headers, text, response.cookies.keys())
+                print_probe_summary(response.status, elapsed_time, anti_bot_signs)
+
+                result = build_result(
+                    url,
+                    response.status,
+                    elapsed_time,
+                    content_length,
+                    headers.get('Content-Type', 'Unknown'),
+                    anti_bot_signs,
+                )
+                if cache is not None:
+                    result = cache.store(url, entry, headers, body_hash(body_bytes), result)
+                return result
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            result = error_result(url, str(e) or type(e).__name__)
+            if cache is not None:
+                result['cache_status'] = 'miss'
+            return result
+
+
+async def _process_urls_async(url_list, max_concurrency, per_host, timeout, max_body_bytes, cache, checkpoint):
+    limiter = HostLimiter(max_concurrency, per_host)
+    # One pooled connector for the whole run: keep-alive connections are reused
+    # between probes of the same host and DNS answers are cached.
+    connector = aiohttp.TCPConnector(limit=max_concurrency, limit_per_host=per_host, ttl_dns_cache=300)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+        async def probe(url):
+            try:
+                result = await check_url_async(session, url, limiter, max_body_bytes, cache)
+            except Exception as e:
+                # One unexpected failure must not cancel the other probes of the run
+                result = error_result(url, f"{type(e).__name__}: {e}")
+            if checkpoint is None:
+                return result
+            checkpoint.append(result)
+
+        return await asyncio.gather(*[probe(url) for url in url_list])
+
+
+def process_urls_async(url_list, max_concurrency=200, per_host=4, timeout=10, max_body_bytes=None, cache=None,
+                       checkpoint=None):
+    """
+    Probe every url concurrently and return the results in the same order as url_list.
+    With a checkpoint, finished urls are skipped and results are appended to it as
+    they complete instead of being returned.
+    """
+    if checkpoint is not None:
+        url_list = checkpoint.pending(url_list)
+    results = asyncio.run(_process_urls_async(url_list, max_concurrency, per_host, timeout, max_body_bytes, cache,
+                                              checkpoint))
+    return None if checkpoint is not None else list(results)
@@ -0,0 +1,55 @@
+import json
+import os
+
+
+class ResultCheckpoint:
+    """
+    Append-only JSONL file of probe results, one line per url, flushed to disk as
+    each probe completes. A restarted run skips the urls already in the file.
+    """
+
+    def __init__(self, filename='url_check_results.jsonl'):
+        self.filename = filename
+        self.file = None
+
+    def done_urls(self):
+        return {result["url"] for result in self.load()}
+
+    def pending(self, url_list):
+        done = self.done_urls()
+        if done:
+            print(f"Resuming: {len(done)} urls already in {self.filename}")
+        return [url for url in url_list if url not in done]
+
+    def append(self, result):
+        if self.file is None:
+            torn_line = False
+            if os.path.exists(self.filename) and os.path.getsize(self.filename) > 0:
+                with open(self.filename, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    torn_line = f.read(1) != b'\n'
+            self.file = open(self.filename, 'a', encoding='utf-8')
+            # Start on a fresh line if the previous run died mid-write
+            if torn_line:
+                self.file.write('\n')
+        self.file.write(json.dumps(result, default=str) + '\n')
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def load(self):
+        if not os.path.exists(self.filename):
+            return []
+        results = []
+        with open(self.filename, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    results.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A run killed mid-write leaves a partial last line; that url is simply probed again
+                    continue
+        return results
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
@@ -0,0 +1,182 @@
+import re
+import time
+from collections import Counter
+from urllib.parse import parse_qs, urljoin, urlsplit
+
+import requests
+from parsel import Selector
+
+from probe_common import host_of, map_by_host
+
+# Query parameters that usually carry the listing page number (curpage= on nab.gov.pk, sheet= on gob.pe)
+PAGE_PARAMS = ["curpage", "page", "paged", "pg", "sheet", "p", "pagina"]
+
+NEXT_TEXTS = ["next", "next page", "siguiente", "seguinte", "următoarea", "urmatoarea", "suivant", "›", "»", ">", ">>"]
+
+BUDGET_COLUMNS = [
+    "sampled_pages",
+    "estimated_total_pages",
+    "pages_is_lower_bound",
+    "detail_links_per_page",
+    "avg_page_bytes",
+    "estimated_requests",
+    "estimated_total_bytes",
+    "estimated_crawl_minutes",
+]
+
+
+def _page_number(url, param):
+    values = parse_qs(urlsplit(url).query).get(param)
+    if values and values[0].isdigit():
+        return int(values[0])
+    return None
+
+
+def find_next_page(selector, url):
+    """
+    Return the absolute url of the next listing page, or None.
+    Covers rel=next, "next" css classes (buttonPaginatie next on politiaromana.ro),
+    next-labelled links, NEXT buttons with an onclick location (nab.gov.pk) and
+    links bumping a page parameter by one.
+    """
+    href = selector.xpath('//link[@rel="next"]/@href | //a[@rel="next"]/@href').get()
+    if href is None:
+        href = selector.xpath('//a[contains(concat(" ", normalize-space(@class), " "), " next ")]/@href').get()
+    if href is None:
+        for link in selector.xpath('//a[@href]'):
+            text = ' '.join(link.xpath('.//text()').getall()).strip().lower()
+            if text in NEXT_TEXTS:
+                href = link.xpath('@href').get()
+                break
+    if href is None:
+        onclick = selector.xpath(
+            '//input[translate(@value, "NEXT", "next")="next"]/@onclick'
+            ' | //button[translate(normalize-space(.), "NEXT", "next")="next"]/@onclick'
+        ).get()
+        if onclick:
+            match = re.search(r"['\"]([^'\"]+)['\"]", onclick)
+            href = match.group(1) if match else None
+    if href is None:
+        for param in PAGE_PARAMS:
+            current = _page_number(url, param)
+            if current is None:
+                continue
+            for link in selector.xpath('//a/@href').getall():
+                if _page_number(urljoin(url, link), param) == current + 1:
+                    href = link
+                    break
+            if href is not None:
+                break
+
+    if href is None or href.startswith(('#', 'javascript:')):
+        return None
+    return urljoin(url, href)
+
+
+def last_page_number(selector, url):
+    """
+    Highest page number linked from the pagination, for urls paged by a query parameter.
+    """
+    for param in PAGE_PARAMS:
+        if _page_number(url, param) is None:
+            continue
+        numbers = [_page_number(urljoin(url, link), param) for link in selector.xpath('//a/@href').getall()]
+        numbers = [number for number in numbers if number is not None]
+        if numbers:
+            return max(numbers)
+    return None
+
+
+def _link_template(url):
+    parts = urlsplit(url)
+    directory = parts.path.rsplit('/', 1)[0]
+    return re.sub(r'\d+', '{n}', directory), tuple(sorted(parse_qs(parts.query)))
+
+
+def count_detail_links(selector, url, skip_urls=()):
+    """
+    Count the links that look like listing entries: same-host links grouped by
+    url template, the biggest group being the detail links of the page.
+    """
+    host = host_of(url)
+    links = set()
+    for href in selector.xpath('//a/@href').getall():
+        if href.startswith(('#', 'javascript:', 'mailto:', 'tel:')):
+            continue
+        absolute = urljoin(url, href).split('#')[0]
+        if host_of(absolute) != host or absolute == url or absolute in skip_urls:
+            continue
+        links.add(absolute)
+    if not links:
+        return 0
+    return Counter(_link_template(link) for link in links).most_common(1)[0][1]
+
+
+def estimate_crawl_budget(url, max_steps=3, request_rate=1.0, timeout=10, session=None):
+    """
+    Follow the pagination of a listing page for up to max_steps pages and
+    extrapolate the requests, bytes and time a full crawl would take at
+    request_rate requests per second.
+    """
+    session = session or requests.Session()
+    page_sizes = []
+    detail_counts = []
+    last_page = None
+    next_url = url
+    visited = []
+    try:
+        while next_url is not None and len(visited) < max_steps and next_url not in visited:
+            print(f"Sampling page: {next_url}")
+            response = session.get(next_url, timeout=timeout)
+            visited.append(next_url)
+            page_sizes.append(len(response.content))
+            selector = Selector(response.text)
+
+            following = find_next_page(selector, next_url)
+            detail_counts.append(count_detail_links(selector, next_url, skip_urls={following}))
+            last_page = last_page_number(selector, next_url) or last_page
+            next_url = following
+            if next_url is not None:
+                time.sleep(1 / request_rate)
+    except requests.exceptions.RequestException as e:
+        print(f"Error sampling URL {url}: {e}")
+
+    if not visited:
+        return dict.fromkeys(BUDGET_COLUMNS)
+
+    pagination_ended = next_url is None
+    if pagination_ended:
+        total_pages = len(visited)
+    else:
+        total_pages = max(last_page or 0, len(visited))
+    detail_links = sum(detail_counts) / len(detail_counts)
+    avg_page_bytes = sum(page_sizes) / len(page_sizes)
+    # Detail pages are assumed to weigh about as much as the listing pages sampled
+    estimated_requests = round(total_pages + total_pages * detail_links)
+
+    return {
+        "sampled_pages": len(visited),
+        "estimated_total_pages": total_pages,
+        "pages_is_lower_bound": not pagination_ended and last_page is None,
+        "detail_links_per_page": round(detail_links, 1),
+        "avg_page_bytes": round(avg_page_bytes),
+        "estimated_requests": estimated_requests,
+        "estimated_total_bytes": round(estimated_requests * avg_page_bytes),
+        "estimated_crawl_minutes": round(estimated_requests / request_rate / 60, 1),
+    }
+
+
+def add_crawl_budgets(results, max_steps=3, request_rate=1.0, max_workers=16):
+    """
+    Add the crawl-budget columns next to each check_url result. Hosts are sampled
+    in parallel, the sites and pages of one host one after another.
+    """
+    def budget(result):
+        if result["status_code"] == "Error":
+            return dict.fromkeys(BUDGET_COLUMNS)
+        return estimate_crawl_budget(result["url"], max_steps, request_rate)
+
+    budgets = map_by_host(budget, results, url_of=lambda result: result["url"], max_workers=max_workers)
+    for result, site_budget in zip(results, budgets):
+        result.update(site_budget)
+    return results
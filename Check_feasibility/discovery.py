@@ -0,0 +1,141 @@
+import gzip
+import json
+import os
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlsplit
+from urllib.robotparser import RobotFileParser
+
+import requests
+
+DEFAULT_SITEMAPS = ["/sitemap.xml", "/sitemap_index.xml"]
+
+DISCOVERY_COLUMNS = ["robots_txt_found", "crawl_delay", "sitemaps_found", "sitemap_urls"]
+
+
+def _origin(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def discovery_filename(cache_dir, url):
+    return os.path.join(cache_dir, urlsplit(url).netloc.lower().replace(':', '_') + '.json')
+
+
+def _tag(element):
+    return element.tag.rsplit('}', 1)[-1]
+
+
+def parse_sitemap(content):
+    """
+    Return (child sitemap urls, [{'loc': ..., 'lastmod': ...}]) from a sitemap or sitemap index.
+    """
+    if content[:2] == b'\x1f\x8b':
+        content = gzip.decompress(content)
+    root = ET.fromstring(content)
+    children = []
+    urls = []
+    for entry in root:
+        fields = {_tag(field): (field.text or '').strip() for field in entry}
+        if not fields.get('loc'):
+            continue
+        if _tag(entry) == 'sitemap':
+            children.append(fields['loc'])
+        elif _tag(entry) == 'url':
+            urls.append({'loc': fields['loc'], 'lastmod': fields.get('lastmod') or None})
+    return children, urls
+
+
+def fetch_discovery(url, session=None, timeout=10, max_sitemaps=50, max_urls=50000):
+    """
+    Fetch robots.txt and every sitemap it lists (or the usual /sitemap.xml
+    locations), following sitemap indexes.
+    """
+    session = session or requests.Session()
+    origin = _origin(url)
+    discovery = {
+        'origin': origin,
+        'fetched_at': time.time(),
+        'robots_txt': None,
+        'crawl_delay': None,
+        'sitemaps': [],
+        'urls': [],
+    }
+
+    candidates = []
+    try:
+        response = session.get(origin + '/robots.txt', timeout=timeout)
+        if response.status_code == 200 and 'html' not in response.headers.get('Content-Type', ''):
+            discovery['robots_txt'] = response.text
+            parser = RobotFileParser()
+            parser.parse(response.text.splitlines())
+            discovery['crawl_delay'] = parser.crawl_delay('*')
+            candidates = list(parser.site_maps() or [])
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching robots.txt for {origin}: {e}")
+    if not candidates:
+        candidates = [origin + path for path in DEFAULT_SITEMAPS]
+
+    seen = set()
+    while candidates and len(seen) < max_sitemaps and len(discovery['urls']) < max_urls:
+        sitemap_url = urljoin(origin, candidates.pop(0))
+        if sitemap_url in seen:
+            continue
+        seen.add(sitemap_url)
+        try:
+            response = session.get(sitemap_url, timeout=timeout)
+            if response.status_code != 200:
+                continue
+            children, urls = parse_sitemap(response.content)
+        except (requests.exceptions.RequestException, ET.ParseError, OSError, EOFError) as e:
+            print(f"Error reading sitemap {sitemap_url}: {e}")
+            continue
+        discovery['sitemaps'].append(sitemap_url)
+        candidates.extend(children)
+        discovery['urls'].extend(urls[:max_urls - len(discovery['urls'])])
+    return discovery
+
+
+def discover_host(url, cache_dir='discovery', ttl_seconds=7 * 24 * 3600, session=None):
+    """
+    Discovery for the host of url, fetched at most once per TTL and kept in
+    cache_dir/<host>.json. Spiders read that file to seed their start urls.
+    """
+    filename = discovery_filename(cache_dir, url)
+    if os.path.exists(filename):
+        with open(filename, encoding='utf-8') as f:
+            discovery = json.load(f)
+        if time.time() - discovery['fetched_at'] < ttl_seconds:
+            return discovery
+
+    print(f"Discovering robots.txt and sitemaps for {_origin(url)}")
+    discovery = fetch_discovery(url, session=session)
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(discovery, f, ensure_ascii=False)
+    return discovery
+
+
+def add_discovery(results, cache_dir='discovery', max_workers=16):
+    """
+    Run discovery once per host and add the robots/sitemap columns to each result.
+    """
+    origins = {}
+    for result in results:
+        if result["status_code"] != "Error":
+            origins.setdefault(_origin(result["url"]), result["url"])
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        discoveries = dict(zip(origins, executor.map(lambda url: discover_host(url, cache_dir), origins.values())))
+
+    for result in results:
+        discovery = discoveries.get(_origin(result["url"]))
+        if discovery is None:
+            result.update(dict.fromkeys(DISCOVERY_COLUMNS))
+            continue
+        result["robots_txt_found"] = discovery['robots_txt'] is not None
+        result["crawl_delay"] = discovery['crawl_delay']
+        result["sitemaps_found"] = len(discovery['sitemaps'])
+        result["sitemap_urls"] = len(discovery['urls'])
+    return results
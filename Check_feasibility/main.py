@@ -1,76 +1,95 @@
+import argparse
 import requests
 import time
 import pandas as pd
 
-
-def check_url(url):
+from probe_common import BodyPrefix, build_result, declared_content_length, detect_anti_bot, error_result, load_urls_from_excel, print_probe_summary
+from probe_cache import ProbeCache, body_hash
+from checkpoint import ResultCheckpoint
+
+
+def check_url(url, max_body_bytes=None, cache=None):
+    """
+    Probe one url. With max_body_bytes set the body is streamed and only its first
+    max_body_bytes are kept for the anti-bot checks. With a ProbeCache the url is
+    skipped inside its TTL and otherwise re-probed with conditional headers.
+    """
+    entry, request_headers = None, {}
+    if cache is not None:
+        entry, fresh_result, request_headers = cache.lookup(url)
+        if fresh_result is not None:
+            print(f"Cached URL: {url}")
+            return fresh_result
     try:
         print(f"Checking URL: {url}")
         start_time = time.time()
-        response = requests.get(url, timeout=10)
+        if max_body_bytes is None:
+            response = requests.get(url, timeout=10, headers=request_headers)
+            body_bytes = response.content
+            body_text = response.text
+            content_length = len(body_bytes)
+        else:
+            with requests.get(url, timeout=10, headers=request_headers, stream=True) as response:
+                body = BodyPrefix(max_body_bytes, declared_content_length(response.headers))
+                for chunk in response.iter_content(chunk_size=16 * 1024):
+                    if not body.feed(chunk):
+                        break
+            body_bytes = bytes(body.prefix)
+            body_text = body.text(response.encoding)
+            content_length = body.content_length
         elapsed_time = time.time() - start_time
 
         # Collect basic information
         status_code = response.status_code
         headers = response.headers
-        content_length = len(response.content)
         content_type = headers.get('Content-Type', 'Unknown')
 
+        if status_code == 304 and entry is not None:
+            print(f"Not modified: {url}")
+            return cache.not_modified(url, entry, elapsed_time)
+
         # Check for anti-bot measures
-        anti_bot_signs = {
-            "captcha": "captcha" in response.text.lower(),
-            "robots.txt": "robots.txt" in response.url.lower(),
-            "csrf_token": "csrf" in response.text.lower(),
-            "cloudflare": "cf-ray" in headers,
-        }
-
-        print(f"Status Code: {status_code}")
-        print(f"Response Time: {elapsed_time:.2f} seconds")
-        print("Anti-Bot Measures Detected:")
-        for key, value in anti_bot_signs.items():
-            print(f"  - {key}: {'Yes' if value else 'No'}")
-        print("-" * 40)
+        anti_bot_signs = detect_anti_bot(response.url, headers, body_text, response.cookies.keys())
+        print_probe_summary(status_code, elapsed_time, anti_bot_signs)
 
         # Return structured results
-        return {
-            "url": url,
-            "status_code": status_code,
-            "response_time": elapsed_time,
-            "content_length": content_length,
-            "content_type": content_type,
-            "captcha_detected": anti_bot_signs["captcha"],
-            "robots_txt_detected": anti_bot_signs["robots.txt"],
-            "csrf_token_detected": anti_bot_signs["csrf_token"],
-            "cloudflare_detected": anti_bot_signs["cloudflare"],
-        }
+        result = build_result(url, status_code, elapsed_time, content_length, content_type, anti_bot_signs)
+        if cache is not None:
+            result = cache.store(url, entry, headers, body_hash(body_bytes), result)
+        return result
 
     except requests.exceptions.RequestException as e:
-        print(f"Error accessing URL {url}: {e}")
-        return {
-            "url": url,
-            "status_code": "Error",
-            "error_message": str(e),
-            "response_time": None,
-            "content_length": None,
-            "content_type": None,
-            "captcha_detected": None,
-            "robots_txt_detected": None,
-            "csrf_token_detected": None,
-            "cloudflare_detected": None,
-        }
-
-
-def process_urls(url_list):
+        result = error_result(url, e)
+        if cache is not None:
+            result['cache_status'] = 'miss'
+        return result
+
+
+def process_urls(url_list, max_body_bytes=None, cache=None, checkpoint=None):
+    """
+    With a checkpoint, urls already in it are skipped and each result is appended
+    to it as soon as it is ready instead of being kept in memory (returns None).
+    """
+    if checkpoint is not None:
+        for url in checkpoint.pending(url_list):
+            checkpoint.append(check_url(url, max_body_bytes, cache))
+        return None
+
     results = []
     for url in url_list:
-        result = check_url(url)
+        result = check_url(url, max_body_bytes, cache)
         results.append(result)
     return results
 
 
-def save_to_excel(data, filename):
+def save_to_excel(data, filename, host_timings=None):
     df = pd.DataFrame(data)
-    df.to_excel(filename, index=False, engine='openpyxl')
+    if host_timings is None:
+        df.to_excel(filename, index=False, engine='openpyxl')
+    else:
+        with pd.ExcelWriter(filename, engine='openpyxl') as writer:
+            df.to_excel(writer, sheet_name='results', index=False)
+            host_timings.to_excel(writer, sheet_name='host_timings', index=False)
     print(f"Results saved to {filename}")
 
 
@@ -104,8 +123,90 @@ if __name__ == "__main__":
         'https://www.poderjudicial.es/cgpj/es/Poder-Judicial/Audiencia-Nacional/Noticias-Judiciales/',
 
     ]
-    results = process_urls(urls_to_check)
+
+    parser = argparse.ArgumentParser(description="Check feasibility of government sites")
+    parser.add_argument('--sites', help="site list workbook, e.g. GOV_714_SITES.xlsx (default: the urls above)")
+    parser.add_argument('--column', default='Source Link', help="column of the site list holding the urls")
+    parser.add_argument('--mode', choices=['sync', 'async'], default='sync')
+    parser.add_argument('--concurrency', type=int, default=200, help="async mode: probes in flight overall")
+    parser.add_argument('--per-host', type=int, default=4, help="async mode: probes in flight per host")
+    parser.add_argument('--max-body-kb', type=int, help="stream bodies and only read the first N KB of each page")
+    parser.add_argument('--cache', help="probe cache file; re-probes unchanged sites with conditional requests")
+    parser.add_argument('--cache-ttl-hours', type=float, default=0, help="skip cached urls younger than this")
+    parser.add_argument('--timing-samples', type=int, default=0,
+                        help="time DNS/connect/TLS/TTFB/download N times per url and add p50/p95 per host")
+    parser.add_argument('--budget-steps', type=int, default=0,
+                        help="follow the pagination N pages and estimate the requests/bytes/time of a full crawl")
+    parser.add_argument('--request-rate', type=float, default=1.0, help="requests per second assumed by the crawl budget")
+    parser.add_argument('--checkpoint', help="JSONL file results are appended to as they finish; reruns resume from it")
+    parser.add_argument('--discover', action='store_true',
+                        help="fetch robots.txt and sitemaps once per host into --discovery-dir for spider seeding")
+    parser.add_argument('--discovery-dir', default='discovery')
+    parser.add_argument('--detect-api', action='store_true',
+                        help="look for JSON/XHR endpoints (.json, /api/, wp-json, _api, format=json) and test them")
+    parser.add_argument('--shard', help="probe only shard I of N (e.g. 0/4) into a partial result file")
+    parser.add_argument('--workers', type=int, default=1, help="split the urls into N shards run by N local processes")
+    parser.add_argument('--merge', nargs='+', metavar='PARTIAL', help="merge partial shard files into the report")
+    parser.add_argument('--output', default="url_check_results.xlsx")
+    args = parser.parse_args()
+
+    if args.sites:
+        urls_to_check = load_urls_from_excel(args.sites, column=args.column)
+    max_body_bytes = args.max_body_kb * 1024 if args.max_body_kb else None
+    probe_options = {'max_body_bytes': max_body_bytes}
+    if args.mode == 'async':
+        probe_options.update(max_concurrency=args.concurrency, per_host=args.per_host)
+    if args.cache:
+        probe_options.update(cache_file=args.cache, cache_ttl_seconds=args.cache_ttl_hours * 3600)
+
+    if args.merge:
+        from sharding import merge_shards
+        results = merge_shards(args.merge, urls_to_check if args.sites else None)
+    elif args.shard:
+        from sharding import parse_shard, run_shard
+        shard_index, num_shards = parse_shard(args.shard)
+        partial_file = run_shard(urls_to_check, shard_index, num_shards, args.output, args.mode, probe_options)
+        print(f"Partial results saved to {partial_file}")
+        raise SystemExit(0)
+    elif args.workers > 1:
+        from sharding import merge_shards, run_local_shards
+        partial_files = run_local_shards(urls_to_check, args.workers, args.output, args.mode, probe_options)
+        results = merge_shards(partial_files, urls_to_check)
+    else:
+        checkpoint = ResultCheckpoint(args.checkpoint) if args.checkpoint else None
+        cache = ProbeCache(args.cache, ttl_seconds=args.cache_ttl_hours * 3600) if args.cache else None
+
+        if args.mode == 'async':
+            from async_prober import process_urls_async
+            results = process_urls_async(urls_to_check, max_concurrency=args.concurrency, per_host=args.per_host,
+                                         max_body_bytes=max_body_bytes, cache=cache, checkpoint=checkpoint)
+        else:
+            results = process_urls(urls_to_check, max_body_bytes, cache, checkpoint)
+
+        if checkpoint is not None:
+            checkpoint.close()
+            # Async results are appended as they complete; report them in the order of the site list
+            from sharding import merge_shards
+            results = merge_shards([args.checkpoint], urls_to_check)
+
+    if args.budget_steps:
+        from crawl_budget import add_crawl_budgets
+        results = add_crawl_budgets(results, max_steps=args.budget_steps, request_rate=args.request_rate)
+
+    if args.discover:
+        from discovery import add_discovery
+        results = add_discovery(results, cache_dir=args.discovery_dir)
+
+    if args.detect_api:
+        from api_detection import add_api_detection
+        results = add_api_detection(results)
+
+    host_timings = None
+    if args.timing_samples:
+        from phase_timing import add_phase_timings, collect_phase_timings, host_timing_percentiles
+        timings_by_url = collect_phase_timings([result['url'] for result in results], samples=args.timing_samples)
+        results = add_phase_timings(results, timings_by_url)
+        host_timings = host_timing_percentiles(timings_by_url)
 
     # Save results to an Excel file
-    output_file = "url_check_results.xlsx"
-    save_to_excel(results, output_file)
+    save_to_excel(results, args.output, host_timings)
@@ -0,0 +1,141 @@
+import socket
+import ssl
+import time
+from urllib.parse import urljoin, urlsplit
+
+import pandas as pd
+
+from probe_common import host_of, map_by_host
+
+PHASES = ["dns_time", "connect_time", "tls_time", "ttfb", "download_time"]
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
+
+
+def _timed_get(url, timeout, max_body_bytes):
+    """
+    One GET over a raw socket so every phase can be timed on its own.
+    Returns (phase timings, status code, redirect location or None).
+    """
+    parts = urlsplit(url)
+    https = parts.scheme == 'https'
+    port = parts.port or (443 if https else 80)
+    path = parts.path or '/'
+    if parts.query:
+        path += '?' + parts.query
+
+    start = time.perf_counter()
+    family, socktype, proto, _, address = socket.getaddrinfo(parts.hostname, port, type=socket.SOCK_STREAM)[0]
+    dns_done = time.perf_counter()
+
+    sock = socket.socket(family, socktype, proto)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(address)
+        connect_done = time.perf_counter()
+
+        tls_done = connect_done
+        if https:
+            sock = ssl.create_default_context().wrap_socket(sock, server_hostname=parts.hostname)
+            tls_done = time.perf_counter()
+
+        request = (
+            f"GET {path} HTTP/1.1\r\nHost: {parts.netloc}\r\nUser-Agent: {USER_AGENT}\r\n"
+            "Accept: */*\r\nAccept-Encoding: identity\r\nConnection: close\r\n\r\n"
+        )
+        sock.sendall(request.encode('latin-1'))
+        head = sock.recv(16 * 1024)
+        first_byte = time.perf_counter()
+
+        received = len(head)
+        while received < max_body_bytes:
+            chunk = sock.recv(64 * 1024)
+            if not chunk:
+                break
+            received += len(chunk)
+        done = time.perf_counter()
+    finally:
+        sock.close()
+
+    status_line, _, rest = head.partition(b'\r\n')
+    try:
+        status_code = int(status_line.split()[1])
+    except (IndexError, ValueError):
+        status_code = None
+    location = None
+    for line in rest.split(b'\r\n\r\n')[0].split(b'\r\n'):
+        name, _, value = line.partition(b':')
+        if name.strip().lower() == b'location':
+            location = urljoin(url, value.strip().decode('latin-1'))
+
+    timings = {
+        "dns_time": dns_done - start,
+        "connect_time": connect_done - dns_done,
+        "tls_time": tls_done - connect_done,
+        "ttfb": first_byte - tls_done,
+        "download_time": done - first_byte,
+    }
+    return timings, status_code, location
+
+
+def measure_phases(url, timeout=10, max_body_bytes=1024 * 1024, max_redirects=5):
+    """
+    Time DNS, TCP connect, TLS handshake, time-to-first-byte and body transfer for a url.
+    Redirects are followed and the final hop is the one reported.
+    """
+    try:
+        for _ in range(max_redirects + 1):
+            timings, status_code, location = _timed_get(url, timeout, max_body_bytes)
+            if status_code in (301, 302, 303, 307, 308) and location:
+                url = location
+                continue
+            break
+        return timings
+    except (OSError, ValueError) as e:
+        print(f"Error timing URL {url}: {e}")
+        return dict.fromkeys(PHASES)
+
+
+def collect_phase_timings(url_list, samples=1, max_workers=32, timeout=10):
+    """
+    Probe each url `samples` times and return {url: [timings, ...]}.
+    Hosts are timed in parallel, but the urls and samples of one host run back to
+    back so a host never sees them in parallel.
+    """
+    def sample_url(url):
+        print(f"Timing URL: {url}")
+        return [measure_phases(url, timeout) for _ in range(samples)]
+
+    return dict(zip(url_list, map_by_host(sample_url, url_list, max_workers=max_workers)))
+
+
+def add_phase_timings(results, timings_by_url):
+    """
+    Add the median of each phase to every result row.
+    """
+    for result in results:
+        samples = pd.DataFrame(timings_by_url.get(result["url"], []), columns=PHASES, dtype=float)
+        for phase in PHASES:
+            median = samples[phase].median()
+            result[phase] = None if pd.isna(median) else median
+    return results
+
+
+def host_timing_percentiles(timings_by_url):
+    """
+    p50 / p95 of every phase per host, across all urls and samples of that host.
+    """
+    rows = []
+    for url, samples in timings_by_url.items():
+        for sample in samples:
+            rows.append(dict(sample, host=host_of(url)))
+    df = pd.DataFrame(rows, columns=["host"] + PHASES)
+    df[PHASES] = df[PHASES].astype(float)
+
+    grouped = df.groupby("host")[PHASES]
+    summary = pd.concat(
+        [grouped.quantile(0.5).add_suffix("_p50"), grouped.quantile(0.95).add_suffix("_p95")], axis=1
+    )
+    summary.insert(0, "samples", grouped.size())
+    columns = ["samples"] + [f"{phase}_{p}" for phase in PHASES for p in ("p50", "p95")]
+    return summary[columns].reset_index()
@@ -0,0 +1,89 @@
+import hashlib
+import json
+import sqlite3
+import time
+
+
+def body_hash(body):
+    return hashlib.sha1(body).hexdigest()
+
+
+class ProbeCache:
+    """
+    On-disk cache of probe results keyed by url.
+
+    Each entry keeps the ETag / Last-Modified validators, a hash of the body that
+    was read and the previous result dict. Entries younger than ttl_seconds are
+    served without any request; older ones are re-probed with If-None-Match /
+    If-Modified-Since so an unchanged site costs a single 304.
+    """
+
+    def __init__(self, filename='probe_cache.sqlite', ttl_seconds=0):
+        self.ttl_seconds = ttl_seconds
+        # Shard processes may share one cache file, so wait for the write lock instead of failing
+        self.conn = sqlite3.connect(filename, timeout=30)
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS probes ('
+            'url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body_hash TEXT, '
+            'result TEXT NOT NULL, checked_at REAL NOT NULL)'
+        )
+        self.conn.commit()
+
+    def get(self, url):
+        row = self.conn.execute(
+            'SELECT etag, last_modified, body_hash, result, checked_at FROM probes WHERE url = ?', (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, stored_hash, result, checked_at = row
+        return {
+            'etag': etag,
+            'last_modified': last_modified,
+            'body_hash': stored_hash,
+            'result': json.loads(result),
+            'checked_at': checked_at,
+        }
+
+    def lookup(self, url):
+        """
+        Return (entry, fresh_result, conditional_headers) for a url about to be probed.
+        fresh_result is set when the entry is still inside its TTL and no request is needed.
+        """
+        entry = self.get(url)
+        if entry is None:
+            return None, None, {}
+        if time.time() - entry['checked_at'] < self.ttl_seconds:
+            return entry, dict(entry['result'], cache_status='fresh'), {}
+
+        headers = {}
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        return entry, None, headers
+
+    def not_modified(self, url, entry, elapsed_time):
+        """The server answered 304: reuse the stored result and restart its TTL."""
+        self.conn.execute('UPDATE probes SET checked_at = ? WHERE url = ?', (time.time(), url))
+        self.conn.commit()
+        return dict(entry['result'], response_time=elapsed_time, cache_status='not_modified')
+
+    def store(self, url, entry, headers, body_digest, result):
+        """Save a fresh probe result and tag it with how it relates to the previous run."""
+        if entry is not None and body_digest is not None and entry['body_hash'] == body_digest:
+            cache_status = 'unchanged'
+        else:
+            cache_status = 'miss'
+        # Errors are not cached, the next run should try the site again
+        if result['status_code'] != 'Error':
+            self.conn.execute(
+                'INSERT OR REPLACE INTO probes (url, etag, last_modified, body_hash, result, checked_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (url, headers.get('ETag'), headers.get('Last-Modified'), body_digest,
+                 json.dumps(result, default=str), time.time()),
+            )
+            self.conn.commit()
+        return dict(result, cache_status=cache_status)
+
+    def close(self):
+        self.conn.close()
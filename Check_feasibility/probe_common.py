@@ -0,0 +1,154 @@
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import pandas as pd
+
+from waf_signatures import SIGNATURES, fingerprint
+
+
+def detect_anti_bot(final_url, headers, text, cookie_names=()):
+    """
+    Look for anti-bot signs in a probed page: every registered signature (headers,
+    cookies set by the site, body markers) is checked in one pass over the body.
+    """
+    matched = fingerprint(headers, cookie_names, text.lower())
+    categories = {SIGNATURES[name].category for name in matched}
+    return {
+        "captcha": "captcha" in categories,
+        "robots.txt": "robots.txt" in final_url.lower(),
+        "csrf_token": "csrf" in categories,
+        "cloudflare": "Cloudflare" in matched,
+        "waf_vendors": [name for name in matched if SIGNATURES[name].category == "waf"],
+    }
+
+
+def decode_body(body_bytes, encoding=None):
+    """Body as text; a charset Python doesn't know (e.g. 'charset=none') falls back to utf-8."""
+    try:
+        return body_bytes.decode(encoding or 'utf-8', errors='replace')
+    except LookupError:
+        return body_bytes.decode('utf-8', errors='replace')
+
+
+def declared_content_length(headers):
+    try:
+        return int(headers.get('Content-Length'))
+    except (TypeError, ValueError):
+        return None
+
+
+class BodyPrefix:
+    """
+    Keeps only the first max_bytes of a streamed body; reading stops there.
+    """
+
+    def __init__(self, max_bytes, declared_length=None):
+        self.max_bytes = max_bytes
+        self.declared_length = declared_length
+        self.prefix = bytearray()
+        self.truncated = False
+
+    def feed(self, chunk):
+        """Add a chunk; returns False once nothing more needs to be read."""
+        room = self.max_bytes - len(self.prefix)
+        if len(chunk) >= room:
+            self.prefix += chunk[:room]
+            # More than the cap arrived (or may follow): the rest of the body is not downloaded
+            self.truncated = len(chunk) > room or self.declared_length != len(self.prefix)
+            return False
+        self.prefix += chunk
+        return True
+
+    @property
+    def content_length(self):
+        """Declared size, the real size when the whole body fit under the cap, otherwise unknown (None)."""
+        if self.declared_length is not None:
+            return self.declared_length
+        return None if self.truncated else len(self.prefix)
+
+    def text(self, encoding=None):
+        return decode_body(bytes(self.prefix), encoding)
+
+
+def print_probe_summary(status_code, elapsed_time, anti_bot_signs):
+    print(f"Status Code: {status_code}")
+    print(f"Response Time: {elapsed_time:.2f} seconds")
+    print("Anti-Bot Measures Detected:")
+    for key, value in anti_bot_signs.items():
+        if key == "waf_vendors":
+            print(f"  - waf vendor: {', '.join(value) or 'None'}")
+        else:
+            print(f"  - {key}: {'Yes' if value else 'No'}")
+    print("-" * 40)
+
+
+def build_result(url, status_code, elapsed_time, content_length, content_type, anti_bot_signs):
+    return {
+        "url": url,
+        "status_code": status_code,
+        "response_time": elapsed_time,
+        "content_length": content_length,
+        "content_type": content_type,
+        "captcha_detected": anti_bot_signs["captcha"],
+        "robots_txt_detected": anti_bot_signs["robots.txt"],
+        "csrf_token_detected": anti_bot_signs["csrf_token"],
+        "cloudflare_detected": anti_bot_signs["cloudflare"],
+        "waf_vendor": '|'.join(anti_bot_signs["waf_vendors"]) or 'N/A',
+    }
+
+
+def error_result(url, error):
+    print(f"Error accessing URL {url}: {error}")
+    return {
+        "url": url,
+        "status_code": "Error",
+        "error_message": str(error),
+        "response_time": None,
+        "content_length": None,
+        "content_type": None,
+        "captcha_detected": None,
+        "robots_txt_detected": None,
+        "csrf_token_detected": None,
+        "cloudflare_detected": None,
+        "waf_vendor": None,
+    }
+
+
+def host_of(url):
+    return urlsplit(url).netloc.lower()
+
+
+def map_by_host(function, items, url_of=lambda item: item, max_workers=16):
+    """
+    function(item) for every item, returned in item order. Hosts are worked on in
+    parallel, the items of one host one after another, so no site sees parallel hits.
+    """
+    by_host = defaultdict(list)
+    for index, item in enumerate(items):
+        by_host[host_of(url_of(item))].append((index, item))
+    results = [None] * len(items)
+
+    def run_host(entries):
+        for index, item in entries:
+            results[index] = function(item)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(run_host, by_host.values()))
+    return results
+
+
+def load_urls_from_excel(filename, column="Source Link", sheet_name=0):
+    """
+    Read the site list (e.g. GOV_714_SITES.xlsx) and return the unique http(s) links in file order.
+    """
+    df = pd.read_excel(filename, sheet_name=sheet_name)
+    urls = []
+    seen = set()
+    for value in df[column].dropna():
+        url = str(value).strip()
+        if not url.lower().startswith(("http://", "https://")) or url in seen:
+            continue
+        seen.add(url)
+        urls.append(url)
+    return urls
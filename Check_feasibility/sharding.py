@@ -0,0 +1,85 @@
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from checkpoint import ResultCheckpoint
+from probe_common import host_of
+
+
+def shard_of(url, num_shards):
+    """
+    Stable shard number for a url. It hashes the host only, so every url of a host
+    lands in the same shard and per-host politeness limits still hold.
+    """
+    digest = hashlib.md5(host_of(url).encode('utf-8')).hexdigest()
+    return int(digest, 16) % num_shards
+
+
+def select_shard(url_list, shard_index, num_shards):
+    return [url for url in url_list if shard_of(url, num_shards) == shard_index]
+
+
+def parse_shard(spec):
+    """'2/8' -> (2, 8); shards are numbered from 0."""
+    index, num_shards = (int(part) for part in spec.split('/'))
+    if not 0 <= index < num_shards:
+        raise ValueError(f"Shard index must be between 0 and {num_shards - 1}: {spec}")
+    return index, num_shards
+
+
+def shard_filename(output, shard_index, num_shards):
+    stem = os.path.splitext(output)[0]
+    return f"{stem}.shard{shard_index}of{num_shards}.jsonl"
+
+
+def run_shard(url_list, shard_index, num_shards, output, mode='async', probe_options=None):
+    """
+    Probe one shard of url_list into its own partial result file and return that file name.
+    The partial file is a checkpoint, so re-running the same shard resumes it.
+    """
+    from main import process_urls
+    from probe_cache import ProbeCache
+
+    probe_options = dict(probe_options or {})
+    cache_file = probe_options.pop('cache_file', None)
+    cache_ttl = probe_options.pop('cache_ttl_seconds', 0)
+    cache = ProbeCache(cache_file, ttl_seconds=cache_ttl) if cache_file else None
+
+    partial_file = shard_filename(output, shard_index, num_shards)
+    checkpoint = ResultCheckpoint(partial_file)
+    urls = select_shard(url_list, shard_index, num_shards)
+    print(f"Shard {shard_index}/{num_shards}: {len(urls)} urls -> {partial_file}")
+    if mode == 'async':
+        from async_prober import process_urls_async
+        process_urls_async(urls, cache=cache, checkpoint=checkpoint, **probe_options)
+    else:
+        process_urls(urls, probe_options.get('max_body_bytes'), cache, checkpoint)
+    checkpoint.close()
+    return partial_file
+
+
+def run_local_shards(url_list, num_shards, output, mode='async', probe_options=None):
+    """
+    Run every shard in its own worker process and return the partial file names.
+    """
+    with ProcessPoolExecutor(max_workers=num_shards) as executor:
+        futures = [
+            executor.submit(run_shard, url_list, index, num_shards, output, mode, probe_options)
+            for index in range(num_shards)
+        ]
+        return [future.result() for future in futures]
+
+
+def merge_shards(partial_files, url_list=None):
+    """
+    Combine partial result files into one list, one row per url. Rows follow
+    url_list when it is given, otherwise the order of the files.
+    """
+    merged = {}
+    for partial_file in partial_files:
+        for result in ResultCheckpoint(partial_file).load():
+            merged[result["url"]] = result
+    if url_list is None:
+        return list(merged.values())
+    ordered = [merged.pop(url) for url in url_list if url in merged]
+    return ordered + list(merged.values())
@@ -0,0 +1,155 @@
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+# category is "waf" for protection vendors, "captcha" / "csrf" for the generic page checks
+Signature = namedtuple("Signature", ["name", "category", "headers", "cookies", "body"])
+
+SIGNATURES = {}
+
+
+def register_signature(name, category="waf", headers=(), cookies=(), body=()):
+    """
+    Add (or replace) a fingerprint.
+
+    headers: (header name, value substring or None) pairs, matched case-insensitively
+    cookies: cookie name prefixes looked for in the cookies the site sets
+    body:    markers searched for in the page body
+    """
+    SIGNATURES[name] = Signature(
+        name,
+        category,
+        tuple((header.lower(), value.lower() if value else None) for header, value in headers),
+        tuple(cookie.lower() for cookie in cookies),
+        tuple(marker.lower() for marker in body),
+    )
+    _body_automaton.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def _body_automaton():
+    """
+    All body markers of all signatures compiled into one alternation, so the body
+    is scanned a single time whatever the number of signatures.
+    Returns (pattern, {marker: names of the signatures the marker proves}).
+    """
+    markers = [(marker, signature.name) for signature in SIGNATURES.values() for marker in signature.body]
+    proves = {}
+    for marker, name in markers:
+        # A marker containing shorter ones ("g-recaptcha" holds "captcha") proves those too
+        proves[marker] = {name} | {other for inner, other in markers if inner in marker}
+    if not proves:
+        return None, proves
+    # Longest markers first so "captcha-delivery.com" is not shadowed by "captcha"
+    ordered = sorted(proves, key=len, reverse=True)
+    return re.compile("|".join(re.escape(marker) for marker in ordered)), proves
+
+
+def fingerprint(headers, cookie_names, text):
+    """
+    Return the names of the signatures matched by a response, sorted.
+    text should already be lowercased.
+    """
+    matched = set()
+
+    header_values = {name.lower(): str(value).lower() for name, value in headers.items()}
+    cookie_names = [name.lower() for name in cookie_names]
+    for signature in SIGNATURES.values():
+        for header, value in signature.headers:
+            if header in header_values and (value is None or value in header_values[header]):
+                matched.add(signature.name)
+        for prefix in signature.cookies:
+            if any(cookie.startswith(prefix) for cookie in cookie_names):
+                matched.add(signature.name)
+
+    pattern, proves = _body_automaton()
+    if pattern is not None:
+        pending = set().union(*proves.values()) - matched
+        for match in pattern.finditer(text):
+            matched |= proves[match.group()]
+            pending -= proves[match.group()]
+            if not pending:
+                break
+    return sorted(matched)
+
+
+# Generic page checks (what check_url always looked for)
+register_signature("captcha", category="captcha", body=["captcha"])
+register_signature("csrf_token", category="csrf", body=["csrf"])
+
+# Protection vendors
+register_signature(
+    "Cloudflare",
+    headers=[("cf-ray", None), ("server", "cloudflare"), ("cf-mitigated", None)],
+    cookies=["__cf_bm", "cf_clearance", "__cfduid"],
+    body=["cf-browser-verification", "/cdn-cgi/challenge-platform/", "attention required! | cloudflare"],
+)
+register_signature(
+    "Imperva Incapsula",  # visid_incap_/incap_ses_ cookies on mom.gov.sg
+    headers=[("x-iinfo", None), ("x-cdn", "incapsula")],
+    cookies=["visid_incap_", "incap_ses_", "nlbi_"],
+    body=["_incapsula_resource", "incapsula incident id"],
+)
+register_signature(
+    "AWS WAF",  # aws-waf-token cookie on gob.pe
+    headers=[("x-amzn-waf-action", None)],
+    cookies=["aws-waf-token"],
+    body=["awswafintegration", "aws-waf-token"],
+)
+register_signature(
+    "Fortinet FortiWeb",  # cookiesession1 on nab.gov.pk and politiaromana.ro
+    cookies=["cookiesession1", "fortiwafsid"],
+    body=[".fgd_icon", "fortigate application control", "web page blocked!"],
+)
+register_signature(
+    "Akamai",
+    headers=[("akamai-grn", None), ("x-akamai-transformed", None), ("server", "akamaighost")],
+    cookies=["ak_bmsc", "bm_sz", "_abck", "bm_sv"],
+    body=["akamai bot manager"],
+)
+register_signature(
+    "F5 BIG-IP ASM",
+    cookies=["bigipserver", "ts01", "f5_cspm"],
+    body=["the requested url was rejected. please consult with your administrator."],
+)
+register_signature(
+    "Sucuri",
+    headers=[("x-sucuri-id", None), ("x-sucuri-cache", None), ("server", "sucuri")],
+    body=["sucuri website firewall", "sucuri.net/privacy-policy"],
+)
+register_signature(
+    "DDoS-Guard",
+    headers=[("server", "ddos-guard")],
+    cookies=["__ddg1", "__ddg2", "__ddgid"],
+)
+register_signature(
+    "PerimeterX",
+    cookies=["_px", "_pxhd", "_pxvid"],
+    body=["px-captcha", "perimeterx"],
+)
+register_signature(
+    "DataDome",
+    headers=[("x-datadome", None), ("x-dd-b", None)],
+    cookies=["datadome"],
+    body=["captcha-delivery.com"],
+)
+register_signature(
+    "Azure Front Door",
+    headers=[("x-azure-ref", None), ("x-fd-healthprobe", None)],
+)
+register_signature(
+    "Barracuda",
+    cookies=["barra_counter_session", "bni__barracuda_lb_cookie"],
+    body=["barracuda networks, inc"],
+)
+register_signature(
+    "ModSecurity",
+    headers=[("server", "mod_security")],
+    body=["this error was generated by mod_security", "mod_security rules triggered"],
+)
+register_signature(
+    "Wordfence",
+    body=["generated by wordfence", "wordfence-blocked"],
+)
+register_signature("Google reCAPTCHA", category="captcha", body=["www.google.com/recaptcha", "g-recaptcha"])
+register_signature("hCaptcha", category="captcha", body=["hcaptcha.com/1/api.js", "h-captcha"])
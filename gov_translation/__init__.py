@@ -0,0 +1,15 @@
+# Translation helpers shared by the spider projects of this repository.
+# Spiders put the repository root on sys.path before importing this package.
+from gov_translation.cache import TranslationCache, default_cache, normalize_text
+from gov_translation.translate import cached_translate
+from gov_translation.dataframe import distinct_texts, translate_frame
+from gov_translation.batching import translate_batch, translate_columns
+from gov_translation.memory import translate_sentences
+from gov_translation.chunking import chunk_text
+from gov_translation.client import TranslationClient, TranslationError, default_client
+from gov_translation.sessions import connection_stats
+from gov_translation.planner import cell_kind, is_translatable, is_translatable_header, plan_columns
+from gov_translation.dates import parse_date
+from gov_translation.language import detect_language
+from gov_translation.glossary import Glossary, load_glossary
+from gov_translation.telemetry import TranslationTelemetry, default_telemetry, track
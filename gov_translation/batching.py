@@ -0,0 +1,207 @@
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from gov_translation.cache import default_cache
+from gov_translation.client import default_client
+from gov_translation.language import detect_language
+from gov_translation.telemetry import current_tag, default_telemetry, track
+from gov_translation.translate import cached_translate
+
+# GoogleTranslator refuses more than 5000 characters, keep some room for the markers
+BATCH_CHAR_LIMIT = 4500
+
+# Threads translating cells one by one with fallback: the cells too long for one request and
+# the cells of batches that could not be split back. They wait on the shared client, which
+# sets the real concurrency; the threads are only started when needed.
+FALLBACK_WORKERS = 32
+
+# Each cell is preceded by a numbered marker on its own line. Digits and brackets come
+# back untouched from the translator, only the spacing around them may change.
+MARKER = "[[{}]]"
+MARKER_PATTERN = re.compile(r'\[\s*\[\s*(\d+)\s*\]\s*\]')
+
+
+def pack_batches(texts, char_limit=BATCH_CHAR_LIMIT):
+    """
+    Group texts into batches whose joined length stays under char_limit.
+    A text longer than the limit goes out alone.
+    """
+    batches = []
+    batch = []
+    size = 0
+    for text in texts:
+        cost = len(text) + len(MARKER.format(len(batch))) + 2
+        if batch and size + cost > char_limit:
+            batches.append(batch)
+            batch = []
+            size = 0
+            cost = len(text) + len(MARKER.format(0)) + 2
+        batch.append(text)
+        size += cost
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def join_batch(batch):
+    return "\n".join(f"{MARKER.format(index)}\n{text}" for index, text in enumerate(batch))
+
+
+def split_batch(translated, expected):
+    """
+    Cut a translated batch back into its cells. Returns None when the markers
+    did not survive (missing, duplicated or reordered), the caller then falls
+    back to one request per cell.
+    """
+    if translated is None:
+        return None
+    parts = MARKER_PATTERN.split(translated)
+    # parts = [text before the first marker, index, cell, index, cell, ...]
+    if parts[0].strip() or len(parts) != 2 * expected + 1:
+        return None
+    indexes = [int(index) for index in parts[1::2]]
+    if indexes != list(range(expected)):
+        return None
+    return [cell.strip() for cell in parts[2::2]]
+
+
+def _completed(translate, text):
+    future = Future()
+    try:
+        future.set_result(translate(text))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def translate_batch(texts, source_lang, target_lang, translate=None, cache=None,
+                    executor=None, fallback=None, char_limit=BATCH_CHAR_LIMIT, skip_target_language=True,
+                    glossary=None):
+    """
+    Translate a list of cells with as few requests as possible, see translate_columns.
+    """
+    return translate_columns(
+        {None: texts}, source_lang, target_lang, translate, cache, executor, fallback, char_limit,
+        skip_target_language, glossary,
+    )[None]
+
+
+def translate_columns(columns, source_lang, target_lang, translate=None, cache=None,
+                      executor=None, fallback=None, char_limit=BATCH_CHAR_LIMIT, skip_target_language=True,
+                      glossary=None):
+    """
+    Translate {column: [cells]} as one workload and return {column: [translations]}.
+
+    Cells found in the site's glossary (see glossary.Glossary) and then cells already
+    in the cache are served from there. The others become tasks: short cells are
+    packed into char_limit sized requests, a cell too long for one request is
+    translated on its own with fallback (cached_translate by default, which splits
+    it into chunks). All the tasks of all the columns are queued at once, longest
+    first, so the long ones start early and the short ones fill the gaps; the
+    shared TranslationClient hands each freed slot to the next task, which keeps
+    every slot busy until the last cell. A custom translate is run through
+    executor when one is given.
+
+    Cells recognised as already written in target_lang (see language.detect_language)
+    are kept as they are unless skip_target_language is False. Every translated cell
+    is cached on its own. A batch whose answer cannot be split back is retried cell
+    by cell with fallback. Values that are not text, or are empty, are returned
+    unchanged. A column key of None counts the work under the current telemetry column.
+    """
+    if cache is None:
+        cache = default_cache()
+    if fallback is None:
+        def fallback(text):
+            return cached_translate(text, source_lang, target_lang, translate, cache)
+    if translate is None:
+        client = default_client()
+
+        def submit(text):
+            return client.submit(text, source_lang, target_lang)
+    elif executor is not None:
+        def submit(text):
+            return executor.submit(translate, text)
+    else:
+        def submit(text):
+            return _completed(translate, text)
+
+    if glossary is not None and not glossary.covers(source_lang, target_lang):
+        glossary = None
+    results = {}
+    pending = {}
+    for column, texts in columns.items():
+        results[column] = list(texts)
+        pending[column] = {}
+        with track(column=column):
+            for position, text in enumerate(texts):
+                if not isinstance(text, str) or text.strip() == '':
+                    continue
+                if skip_target_language and detect_language(text) == target_lang:
+                    default_telemetry().record_same_language(current_tag())
+                    continue
+                translated = glossary.lookup(text) if glossary is not None else None
+                if translated is not None:
+                    results[column][position] = translated
+                    continue
+                translated = cache.get(source_lang, target_lang, text)
+                if translated is not None:
+                    results[column][position] = translated
+                else:
+                    pending[column].setdefault(text, []).append(position)
+
+    # (characters, column, batch) for every request to make, longest first
+    tasks = [
+        (sum(map(len, batch)), column, batch)
+        for column, texts in pending.items()
+        for batch in pack_batches(list(texts), char_limit)
+    ]
+    tasks.sort(key=lambda task: task[0], reverse=True)
+
+    spider = current_tag()[0]
+
+    def run_fallback(column, text):
+        # One failing cell keeps its original text instead of losing the finished batches
+        with track(spider, column):
+            try:
+                translated = fallback(text)
+            except Exception as e:
+                print(f"Error translating '{text[:80]}': {e}")
+                return text
+        return text if translated is None else translated
+
+    with ThreadPoolExecutor(max_workers=FALLBACK_WORKERS) as fallback_executor:
+        futures = []
+        for size, column, batch in tasks:
+            if len(batch) == 1 and len(batch[0]) > char_limit:
+                futures.append(fallback_executor.submit(run_fallback, column, batch[0]))
+                continue
+            with track(column=column):
+                default_telemetry().record_batch(current_tag(), len(batch))
+                futures.append(submit(join_batch(batch)))
+
+        retries = []
+        for (size, column, batch), future in zip(tasks, futures):
+            if len(batch) == 1 and len(batch[0]) > char_limit:
+                cells = [future.result()]
+            else:
+                cells = None
+                try:
+                    cells = split_batch(future.result(), len(batch))
+                except Exception as e:
+                    print(f"Error translating a batch of {len(batch)} cells: {e}")
+                if cells is None:
+                    print(f"Batch of {len(batch)} cells could not be split back, translating cell by cell")
+                    retries.append((column, batch, [fallback_executor.submit(run_fallback, column, text) for text in batch]))
+                    continue
+                cache.set_many(source_lang, target_lang, zip(batch, cells))
+            _scatter(results[column], pending[column], batch, cells)
+
+        for column, batch, cell_futures in retries:
+            _scatter(results[column], pending[column], batch, [future.result() for future in cell_futures])
+    return results
+
+
+def _scatter(values, positions, batch, cells):
+    for text, translated in zip(batch, cells):
+        for position in positions[text]:
+            values[position] = translated
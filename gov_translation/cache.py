@@ -0,0 +1,136 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+
+from gov_translation.telemetry import current_tag, default_telemetry
+
+# translation_cache.sqlite at the repository root, shared by every spider project
+DEFAULT_CACHE_PATH = os.environ.get(
+    'GOV_TRANSLATION_CACHE',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'translation_cache.sqlite'),
+)
+
+
+def normalize_text(text):
+    """
+    Whitespace and unicode differences should not make two cells different cache keys.
+    """
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+
+def cache_key(source_lang, target_lang, text):
+    raw = f"{source_lang}\x1f{target_lang}\x1f{normalize_text(text)}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+class TranslationCache:
+    """
+    Persistent translation memo shared by all spiders.
+
+    SQLite in WAL mode with a memory-mapped file, keyed by (source lang, target lang,
+    normalized text hash). Each thread gets its own connection, so the cache can be
+    used from the ThreadPoolExecutor workers. Once the table grows past max_entries
+    the least recently used rows are evicted.
+    """
+
+    EVICT_EVERY = 1000
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=500_000):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        conn = self._conn()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS translations ('
+            'key TEXT PRIMARY KEY, source_lang TEXT NOT NULL, target_lang TEXT NOT NULL, '
+            'text TEXT NOT NULL, translation TEXT NOT NULL, last_used REAL NOT NULL)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS translations_last_used ON translations (last_used)')
+        conn.commit()
+        self.evict()
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA mmap_size=268435456')
+            self._local.conn = conn
+        return conn
+
+    def get(self, source_lang, target_lang, text, record_miss=True):
+        """
+        Cached translation of text, or None. record_miss=False is for a whole-text probe
+        followed by lookups of its parts: a hit is counted, a miss is left to the parts.
+        """
+        key = cache_key(source_lang, target_lang, text)
+        conn = self._conn()
+        row = conn.execute('SELECT translation FROM translations WHERE key = ?', (key,)).fetchone()
+        if row is not None or record_miss:
+            default_telemetry().record_cache(current_tag(), row is not None, row is None)
+        if row is None:
+            return None
+        conn.execute('UPDATE translations SET last_used = ? WHERE key = ?', (time.time(), key))
+        conn.commit()
+        return row[0]
+
+    def set(self, source_lang, target_lang, text, translation):
+        self.set_many(source_lang, target_lang, [(text, translation)])
+
+    def set_many(self, source_lang, target_lang, pairs):
+        now = time.time()
+        rows = [
+            (cache_key(source_lang, target_lang, text), source_lang, target_lang, normalize_text(text), translation, now)
+            for text, translation in pairs
+        ]
+        conn = self._conn()
+        conn.executemany(
+            'INSERT OR REPLACE INTO translations (key, source_lang, target_lang, text, translation, last_used) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            rows,
+        )
+        conn.commit()
+
+        with self._lock:
+            self._writes += len(rows)
+            due = self._writes >= self.EVICT_EVERY
+            if due:
+                self._writes = 0
+        if due:
+            self.evict()
+
+    def evict(self):
+        """Drop the least recently used rows beyond max_entries."""
+        conn = self._conn()
+        (count,) = conn.execute('SELECT COUNT(*) FROM translations').fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            conn.execute(
+                'DELETE FROM translations WHERE key IN '
+                '(SELECT key FROM translations ORDER BY last_used ASC LIMIT ?)',
+                (excess,),
+            )
+            conn.commit()
+
+    def __len__(self):
+        (count,) = self._conn().execute('SELECT COUNT(*) FROM translations').fetchone()
+        return count
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def default_cache():
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = TranslationCache()
+        return _default_cache
@@ -0,0 +1,53 @@
+import re
+
+# Longest text sent in one request; GoogleTranslator refuses more than 5000 characters
+CHUNK_CHAR_LIMIT = 4500
+
+# Sentence ends (., !, ?, ; and their fullwidth forms) followed by whitespace, or line breaks
+SENTENCE_END = re.compile(r'(?<=[.!?;。！？])\s+|\s*\n+\s*')
+
+
+def split_sentences(text):
+    return [sentence for sentence in SENTENCE_END.split(text) if sentence and sentence.strip()]
+
+
+def _split_long(sentence, limit):
+    """A single sentence over the limit is cut between words, or hard cut as a last resort."""
+    pieces = []
+    piece = ''
+    for word in sentence.split():
+        while len(word) > limit:
+            if piece:
+                pieces.append(piece)
+                piece = ''
+            pieces.append(word[:limit])
+            word = word[limit:]
+        if piece and len(piece) + 1 + len(word) > limit:
+            pieces.append(piece)
+            piece = word
+        else:
+            piece = f"{piece} {word}" if piece else word
+    if piece:
+        pieces.append(piece)
+    return pieces
+
+
+def chunk_text(text, limit=CHUNK_CHAR_LIMIT):
+    """
+    Split text into chunks of at most limit characters, cutting on sentence
+    boundaries so every chunk can be translated on its own.
+    """
+    if len(text) <= limit:
+        return [text]
+    chunks = []
+    chunk = ''
+    for sentence in split_sentences(text):
+        for piece in (_split_long(sentence, limit) if len(sentence) > limit else [sentence]):
+            if chunk and len(chunk) + 1 + len(piece) > limit:
+                chunks.append(chunk)
+                chunk = piece
+            else:
+                chunk = f"{chunk} {piece}" if chunk else piece
+    if chunk:
+        chunks.append(chunk)
+    return chunks
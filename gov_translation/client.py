@@ -0,0 +1,253 @@
+import asyncio
+import atexit
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import aiohttp
+from parsel import Selector
+
+from gov_translation.telemetry import current_tag, default_telemetry
+
+# Same endpoint and result markup GoogleTranslator (deep_translator) scrapes
+TRANSLATE_URL = 'https://translate.google.com/m'
+
+HEADERS = {
+    'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
+    'accept-language': 'en-US,en;q=0.9',
+}
+
+
+class TranslationError(Exception):
+    pass
+
+
+def retry_after_seconds(value):
+    """Retry-After is either a number of seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_translation(html):
+    selector = Selector(text=html)
+    for query in ('//div[@class="result-container"]', '//div[@class="t0"]'):
+        element = selector.xpath(query)
+        if element:
+            return ''.join(element.xpath('.//text()').getall()).strip()
+    return None
+
+
+class TokenBucket:
+    """
+    Global request rate: rate tokens per second, bursts of up to capacity.
+    A Retry-After from the provider pauses the whole bucket.
+    Only used from the client's event loop, so it needs no lock.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            if now < self.paused_until:
+                await asyncio.sleep(self.paused_until - now)
+                continue
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds):
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+
+class AIMDLimiter:
+    """
+    Number of requests in flight, tuned by additive increase / multiplicative decrease:
+    each success adds 1/limit (about +1 per round of requests), each 429 or 5xx
+    multiplies the limit by decrease.
+    """
+
+    def __init__(self, initial=4, minimum=1, maximum=64, decrease=0.5):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease = decrease
+        self.in_flight = 0
+        self._condition = None
+
+    async def acquire(self):
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self, throttled):
+        async with self._condition:
+            self.in_flight -= 1
+            if throttled:
+                self.limit = max(self.minimum, self.limit * self.decrease)
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+
+class TranslationClient:
+    """
+    Asynchronous Google Translate client shared by every spider of the process.
+
+    It runs its own event loop in a background thread (the spiders already run
+    inside the asyncio reactor), so blocking code calls translate() and threads or
+    other code can submit() many texts at once. All requests go through one token
+    bucket and one AIMD concurrency limit; 429 and 5xx answers shrink the limit,
+    honor Retry-After and are retried with jittered exponential backoff.
+    """
+
+    def __init__(self, rate=5.0, burst=10, initial_concurrency=4, max_concurrency=32,
+                 max_retries=5, timeout=30, url=TRANSLATE_URL):
+        self.url = url
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.bucket = TokenBucket(rate, burst)
+        self.limiter = AIMDLimiter(initial_concurrency, maximum=max_concurrency)
+        self.requests = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self._session = None
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name='translation-client', daemon=True)
+        self.thread.start()
+
+    async def _on_request_start(self, session, context, params):
+        self.requests += 1
+
+    async def _on_connection_create_end(self, session, context, params):
+        self.connections_created += 1
+
+    async def _on_connection_reuseconn(self, session, context, params):
+        self.connections_reused += 1
+
+    async def _get_session(self):
+        # One keep-alive session per client, i.e. per event loop, shared by every spider of the process
+        if self._session is None:
+            trace_config = aiohttp.TraceConfig()
+            trace_config.on_request_start.append(self._on_request_start)
+            trace_config.on_connection_create_end.append(self._on_connection_create_end)
+            trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+            self._session = aiohttp.ClientSession(
+                headers=HEADERS,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency, ttl_dns_cache=300),
+                trace_configs=[trace_config],
+            )
+        return self._session
+
+    def connection_stats(self):
+        return {
+            'requests': self.requests,
+            'connections_created': self.connections_created,
+            'connections_reused': self.connections_reused,
+        }
+
+    async def translate_async(self, text, source_lang, target_lang, max_retries=None, tag=None):
+        if source_lang == target_lang or not text.strip():
+            return text
+        max_retries = self.max_retries if max_retries is None else max_retries
+        session = await self._get_session()
+        params = {'sl': source_lang, 'tl': target_lang, 'q': text.strip()}
+
+        telemetry = default_telemetry()
+        if tag is None:
+            tag = current_tag()
+        error = None
+        for attempt in range(max_retries + 1):
+            await self.bucket.acquire()
+            await self.limiter.acquire()
+            throttled = False
+            failed = True
+            retry_after = None
+            started = time.perf_counter()
+            try:
+                async with session.get(self.url, params=params) as response:
+                    body = await response.text()
+                    if response.status == 429 or response.status >= 500:
+                        throttled = True
+                        retry_after = retry_after_seconds(response.headers.get('Retry-After'))
+                        error = f"HTTP {response.status}"
+                    elif response.status != 200:
+                        raise TranslationError(f"HTTP {response.status} translating {text[:50]!r}")
+                    else:
+                        translated = parse_translation(body)
+                        if translated is None:
+                            raise TranslationError(f"No translation found for {text[:50]!r}")
+                        failed = False
+                        return translated
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = str(e) or type(e).__name__
+            finally:
+                await self.limiter.release(throttled)
+                telemetry.record_request(
+                    tag, len(params['q']), time.perf_counter() - started,
+                    throttled=throttled, error=failed and not throttled, retry=attempt > 0,
+                )
+
+            if attempt == max_retries:
+                break
+            if retry_after is not None:
+                self.bucket.pause(retry_after)
+                wait_time = retry_after
+            else:
+                wait_time = min(60, 2 ** attempt) * random.uniform(0.5, 1.5)
+            print(f"Translation request failed ({error}). Retrying in {wait_time:.2f} seconds (Attempt {attempt + 1}/{max_retries})")
+            await asyncio.sleep(wait_time)
+        raise TranslationError(f"Giving up translating {text[:50]!r} after {max_retries} retries: {error}")
+
+    def submit(self, text, source_lang, target_lang, max_retries=None):
+        """
+        Schedule a translation, returns a concurrent.futures.Future. The request is
+        counted under the telemetry tag of the calling thread.
+        """
+        return asyncio.run_coroutine_threadsafe(
+            self.translate_async(text, source_lang, target_lang, max_retries, current_tag()), self.loop
+        )
+
+    def translate(self, text, source_lang, target_lang, max_retries=None):
+        return self.submit(text, source_lang, target_lang, max_retries).result()
+
+    def close(self):
+        if self._session is not None:
+            asyncio.run_coroutine_threadsafe(self._session.close(), self.loop).result()
+            self._session = None
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def default_client():
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = TranslationClient()
+            atexit.register(_default_client.close)
+        return _default_client
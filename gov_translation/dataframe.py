@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from gov_translation.telemetry import track
+
+
+def distinct_texts(df, columns):
+    """
+    Non-empty strings appearing in any of the columns, each listed once.
+    """
+    present = [column for column in columns if column in df.columns]
+    if not present:
+        return []
+    values = pd.unique(df[present].to_numpy().ravel())
+    return [value for value in values if isinstance(value, str) and value.strip() != '']
+
+
+def translate_frame(df, columns, translate_many, translatable=None, glossary=None):
+    """
+    Translate several columns by their distinct values: each column is factorized
+    and translate_many receives {column: unique values} of all the columns in a
+    single call (see translate_columns) and returns {column: translations}. Values
+    rejected by translatable (see planner.is_translatable) and missing values are
+    passed through untouched. Returns {column: values}.
+
+    Values found in glossary (see glossary.Glossary) are answered first and not
+    passed on; misses are reported with the number of cells holding them.
+    """
+    factorized = {}
+    wanted = {}
+    for column in columns:
+        codes, uniques = pd.factorize(df[column], use_na_sentinel=True)
+        uniques = list(uniques)
+        positions = [index for index, value in enumerate(uniques) if translatable is None or translatable(value)]
+        if glossary is not None:
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            missed = []
+            with track(column=column):
+                for index in positions:
+                    translated = glossary.lookup(uniques[index], int(counts[index]))
+                    if translated is None:
+                        missed.append(index)
+                    else:
+                        uniques[index] = translated
+            positions = missed
+        factorized[column] = (codes, uniques, positions)
+        wanted[column] = [uniques[index] for index in positions]
+
+    translated = translate_many(wanted)
+    result = {}
+    for column, (codes, uniques, positions) in factorized.items():
+        for index, value in zip(positions, translated[column]):
+            uniques[index] = value
+        values = df[column].tolist()
+        result[column] = [values[position] if code == -1 else uniques[code] for position, code in enumerate(codes)]
+    return result
@@ -0,0 +1,77 @@
+import re
+import unicodedata
+from datetime import date
+
+# Month names (full and abbreviated) of the languages the spiders scrape, without accents
+MONTHS = {
+    'en': ['january', 'february', 'march', 'april', 'may', 'june',
+           'july', 'august', 'september', 'october', 'november', 'december'],
+    'es': ['enero', 'febrero', 'marzo', 'abril', 'mayo', 'junio',
+           'julio', 'agosto', 'septiembre', 'octubre', 'noviembre', 'diciembre'],
+    'pt': ['janeiro', 'fevereiro', 'marco', 'abril', 'maio', 'junho',
+           'julho', 'agosto', 'setembro', 'outubro', 'novembro', 'dezembro'],
+    'ro': ['ianuarie', 'februarie', 'martie', 'aprilie', 'mai', 'iunie',
+           'iulie', 'august', 'septembrie', 'octombrie', 'noiembrie', 'decembrie'],
+}
+EXTRA_MONTHS = {'setiembre': 9, 'sept': 9}  # Peruvian spelling
+
+MONTH_NUMBERS = dict(EXTRA_MONTHS)
+for _names in MONTHS.values():
+    for _number, _name in enumerate(_names, start=1):
+        MONTH_NUMBERS.setdefault(_name, _number)
+        MONTH_NUMBERS.setdefault(_name[:3], _number)
+
+# Words that may sit between the parts of a written date: "15 de enero de 2024", "15 of January"
+FILLERS = {'de', 'del', 'of', 'the'}
+
+NUMERIC_YMD = re.compile(r'(\d{4})[./-](\d{1,2})[./-](\d{1,2})')
+NUMERIC_DMY = re.compile(r'(\d{1,2})[./-](\d{1,2})[./-](\d{4})')
+TOKEN = re.compile(r'\d+|[a-z]+')
+
+
+def _plain(text):
+    text = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(ch for ch in text if not unicodedata.combining(ch))
+
+
+def _iso(year, month, day):
+    try:
+        return date(int(year), int(month), int(day)).isoformat()
+    except ValueError:
+        return None
+
+
+def parse_date(text):
+    """
+    Date written in Spanish, Portuguese, Romanian or English, or in the usual
+    numeric formats, as 'YYYY-MM-DD'. Returns None when no date is found.
+
+    '15 de enero de 2024 - 10:30 a. m.', 'lunes, 3 de junio de 2024', 'January 15, 2024',
+    '15 ianuarie 2024', '2024.01.15', '15/01/2024' (day first) are all understood.
+    """
+    if not isinstance(text, str):
+        return None
+    text = _plain(text)
+
+    match = NUMERIC_YMD.search(text)
+    if match:
+        return _iso(*match.groups())
+    match = NUMERIC_DMY.search(text)
+    if match:
+        day, month, year = match.groups()
+        return _iso(year, month, day)
+
+    tokens = [token for token in TOKEN.findall(text) if token not in FILLERS]
+    for position, token in enumerate(tokens):
+        month = MONTH_NUMBERS.get(token)
+        if month is None:
+            continue
+        before = tokens[position - 1] if position > 0 else ''
+        after = tokens[position + 1:position + 3]
+        # day month year: "15 de enero de 2024", "15 january 2024"
+        if before.isdigit() and len(before) <= 2 and after and after[0].isdigit() and len(after[0]) == 4:
+            return _iso(after[0], month, before)
+        # month day year: "january 15, 2024"
+        if len(after) == 2 and after[0].isdigit() and len(after[0]) <= 2 and after[1].isdigit() and len(after[1]) == 4:
+            return _iso(after[1], month, after[0])
+    return None
@@ -0,0 +1,103 @@
+import copy
+import json
+import os
+import threading
+import unicodedata
+from collections import Counter
+
+import pandas as pd
+
+from gov_translation.telemetry import current_tag, default_telemetry
+
+# One <site>.json per spider: {"version": ..., "source": "es", "target": "en", "entries": {term: translation}}
+GLOSSARY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'glossaries')
+
+# Longer cells are sentences, not terms: they are neither looked up nor reported as misses
+MAX_TERM_CHARS = 80
+
+
+def term_key(text):
+    """'DISPOSICIÓN LEGAL INFRINGIDA', 'disposición_legal_infringida' and 'Disposicion legal infringida:' match."""
+    text = unicodedata.normalize('NFKD', text.casefold())
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return ' '.join(text.replace('_', ' ').split()).strip(' .,:;')
+
+
+class Glossary:
+    """
+    Fixed translations of a site's closed vocabularies (column names, sanction types,
+    decision categories), answered from memory before the cache and the translator.
+
+    A term is found by its exact text first, then by term_key. Every term looked up
+    and not found is counted, so the most frequent misses can be added to the file.
+    """
+
+    count_misses = True
+
+    def __init__(self, name, entries, source_lang, target_lang, version=None):
+        self.name = name
+        self.version = version
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        self.exact = dict(entries)
+        self.normalized = {term_key(term): translation for term, translation in entries.items()}
+        self.misses = Counter()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path, name=None):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        name = name or os.path.splitext(os.path.basename(path))[0]
+        return cls(name, data['entries'], data['source'], data['target'], data.get('version'))
+
+    def covers(self, source_lang, target_lang):
+        return self.source_lang == source_lang and self.target_lang == target_lang
+
+    def lookup(self, text, count=1):
+        """Translation of text, or None. count is how many cells hold the text, for the miss report."""
+        if not isinstance(text, str) or len(text) > MAX_TERM_CHARS:
+            return None
+        translation = self.exact.get(text)
+        if translation is None:
+            translation = self.normalized.get(term_key(text))
+        if translation is not None:
+            default_telemetry().record_glossary(current_tag(), count)
+            return translation
+        if self.count_misses:
+            with self._lock:
+                self.misses[text] += count
+        return None
+
+    def silent(self):
+        """The same glossary, without counting misses (for lookups the miss report already gets elsewhere)."""
+        glossary = copy.copy(self)
+        glossary.count_misses = False
+        return glossary
+
+    def top_misses(self, n=50):
+        with self._lock:
+            return self.misses.most_common(n)
+
+    def write_misses(self, filename, n=200):
+        """The n most frequent misses, candidates for the next version of the glossary."""
+        df = pd.DataFrame(self.top_misses(n), columns=['term', 'count'])
+        df.insert(0, 'glossary_version', self.version)
+        df.to_excel(filename, index=False)
+        print(f"Glossary misses saved to {filename}")
+
+
+_glossaries = {}
+_glossaries_lock = threading.Lock()
+
+
+def load_glossary(name):
+    """The glossary of a site (spider name) from GLOSSARY_DIR, loaded once; None when it has none."""
+    with _glossaries_lock:
+        if name not in _glossaries:
+            path = os.path.join(GLOSSARY_DIR, f"{name}.json")
+            glossary = Glossary.load(path, name) if os.path.exists(path) else None
+            if glossary is not None:
+                print(f"Loaded glossary {name} version {glossary.version} ({len(glossary.exact)} terms)")
+            _glossaries[name] = glossary
+        return _glossaries[name]
@@ -0,0 +1,65 @@
+import re
+
+# Frequent short words of the languages the spiders scrape. Words shared by several
+# languages ("de", "la", "a", ...) count for each of them; the rare ones decide.
+LANGUAGE_WORDS = {
+    'en': {
+        'the', 'and', 'of', 'to', 'is', 'was', 'for', 'with', 'on', 'that', 'this', 'by', 'from',
+        'be', 'at', 'has', 'have', 'had', 'not', 'which', 'it', 'an', 'or', 'were', 'been', 'his',
+        'her', 'their', 'will', 'would', 'who', 'into', 'after', 'under', 'other', 'born', 'years',
+    },
+    'es': {
+        'el', 'los', 'las', 'del', 'y', 'que', 'por', 'para', 'con', 'una', 'es', 'se', 'su', 'sus',
+        'al', 'lo', 'como', 'más', 'pero', 'fue', 'sobre', 'entre', 'también', 'según', 'año', 'desde',
+        'hasta', 'sin', 'este', 'esta', 'son', 'ha', 'han', 'muy', 'cuando', 'donde', 'en', 'la', 'de',
+    },
+    'pt': {
+        'o', 'os', 'do', 'da', 'dos', 'das', 'em', 'no', 'na', 'nos', 'nas', 'um', 'uma', 'que', 'para',
+        'com', 'por', 'não', 'é', 'ao', 'à', 'pelo', 'pela', 'foi', 'são', 'também', 'mais', 'seu',
+        'sua', 'como', 'entre', 'sobre', 'até', 'e', 'de', 'ou', 'processo', 'tribunal',
+    },
+    'ro': {
+        'și', 'în', 'din', 'la', 'cu', 'pe', 'pentru', 'este', 'care', 'sau', 'de', 'un', 'o', 'a',
+        'al', 'ale', 'lui', 'fost', 'sunt', 'acest', 'această', 'nu', 'mai', 'după', 'prin', 'către',
+        'ani', 'născut', 'născută', 'să', 'fi', 'au', 'iar', 'fără', 'dintre', 'până',
+    },
+}
+
+# Letters and letter groups typical of one of those languages only; " " marks a word end
+LANGUAGE_NGRAMS = {
+    'en': ['th', 'wh', 'ck', 'ght', 'ing ', 'oo'],
+    'es': ['ñ', '¿', '¡', 'ción', 'll'],
+    'pt': ['ã', 'õ', 'ç', 'lh', 'nh'],
+    'ro': ['ă', 'ș', 'ț', 'î', 'ul ', 'lor '],
+}
+
+WORD = re.compile(r'[^\W\d_]+')
+
+
+def detect_language(text, min_score=2):
+    """
+    Language of text among LANGUAGE_WORDS ('en', 'es', 'pt', 'ro'), or None when
+    the text is too short or too mixed to tell (names, codes, a single word).
+    Works offline from the word and n-gram profiles above, every match scores one.
+    The winner also needs one of its words: letters alone do not make a language
+    (a Spanish cell naming "Kwik Shop" is still Spanish).
+    """
+    if not isinstance(text, str):
+        return None
+    # Romanian is often typed with cedillas instead of commas below
+    text = text.lower().replace('ş', 'ș').replace('ţ', 'ț')
+    words = WORD.findall(text)
+    word_hits = {
+        language: sum(word in vocabulary for word in words) for language, vocabulary in LANGUAGE_WORDS.items()
+    }
+    scores = dict(word_hits)
+    padded = ' '.join(words) + ' '
+    for language, ngrams in LANGUAGE_NGRAMS.items():
+        scores[language] += sum(padded.count(ngram) for ngram in ngrams)
+
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    (best, best_score), (_, second_score) = ranked[0], ranked[1]
+    if best_score < min_score or best_score == second_score or not word_hits[best]:
+        return None
+    return best
+
@@ -0,0 +1,101 @@
+import re
+
+from gov_translation.batching import translate_columns
+from gov_translation.cache import default_cache
+from gov_translation.chunking import SENTENCE_END
+from gov_translation.telemetry import track
+
+# Same boundaries as chunking, but the separators are kept: text == ''.join(SEGMENT.split(text)),
+# sentences at the even indexes and the whitespace between them at the odd ones
+SEGMENT = re.compile(f'({SENTENCE_END.pattern})')
+
+# Quotes and brackets that may open the last word of a sentence
+OPENING = '(["\'«“¿¡'
+
+# Capitalised abbreviations longer than three letters (shorter ones, 'Dr.', 'Lic.', 'Sra.', are all taken)
+LONG_ABBREVIATIONS = {'Blgo', 'Gral', 'Cnel', 'Prof', 'Dpto', 'Mgtr', 'Exmo', 'Ilmo', 'Conf'}
+
+
+def _ends_with_abbreviation(sentence):
+    """
+    True when the dot ending sentence belongs to an abbreviation: a letter or initials
+    ('A.', 'E.M.', 'S.A.'), a list number ('2.') or a capitalised abbreviation ('Dr.', 'Lic.', 'Blgo.').
+    """
+    words = sentence.split()
+    if not words or not words[-1].endswith('.'):
+        return False
+    letters = words[-1].lstrip(OPENING)[:-1]
+    if letters.isdigit() or all(len(part) == 1 and part.isalpha() for part in letters.split('.')):
+        return True
+    if letters in LONG_ABBREVIATIONS:
+        return True
+    return letters.isalpha() and len(letters) <= 3 and letters[0].isupper() and letters[1:].islower()
+
+
+def segment(text):
+    """
+    SEGMENT.split(text) without the cuts after abbreviations, which would send half
+    sentences to the memory. Line breaks always cut. Chunking keeps the looser rule:
+    its chunks run to thousands of characters, where an early cut costs little.
+    """
+    parts = SEGMENT.split(text)
+    segments = [parts[0]]
+    for index in range(1, len(parts), 2):
+        separator, sentence = parts[index], parts[index + 1]
+        if '\n' not in separator and _ends_with_abbreviation(segments[-1]):
+            segments[-1] += separator + sentence
+        else:
+            segments += [separator, sentence]
+    return segments
+
+
+def translate_sentences(columns, source_lang, target_lang, cache=None, min_sentences=2, **options):
+    """
+    translate_columns with a translation memory per sentence.
+
+    Press releases and decision summaries repeat the same stock sentences (agency
+    descriptions, legal citations, closing lines) inside cells that are all
+    different, so a cell of min_sentences sentences or more that is not cached
+    whole is split into sentences. Each sentence goes through the cache and only
+    the new ones are sent, in the same longest-first queue as the short cells.
+    The cell is put back together with its original spacing and line breaks.
+    options are passed to translate_columns.
+    """
+    if cache is None:
+        cache = default_cache()
+    results = {}
+    units = {}
+    layouts = {}
+    for column, texts in columns.items():
+        results[column] = list(texts)
+        units[column] = []
+        layouts[column] = []
+        with track(column=column):
+            for position, text in enumerate(texts):
+                parts = segment(text) if isinstance(text, str) else []
+                sentences = [index for index in range(0, len(parts), 2) if parts[index].strip()]
+                if len(sentences) < min_sentences:
+                    layouts[column].append((position, None, None, len(units[column])))
+                    units[column].append(text)
+                    continue
+                # On a miss the sentences are looked up (and counted) instead
+                translated = cache.get(source_lang, target_lang, text, record_miss=False)
+                if translated is not None:
+                    results[column][position] = translated
+                    continue
+                layouts[column].append((position, parts, sentences, len(units[column])))
+                units[column].extend(parts[index] for index in sentences)
+
+    translated_units = translate_columns(units, source_lang, target_lang, cache=cache, **options)
+    for column, layout in layouts.items():
+        translated = translated_units[column]
+        for position, parts, sentences, start in layout:
+            if parts is None:
+                results[column][position] = translated[start]
+                continue
+            parts = list(parts)
+            for offset, index in enumerate(sentences):
+                if isinstance(translated[start + offset], str):
+                    parts[index] = translated[start + offset]
+            results[column][position] = ''.join(parts)
+    return results
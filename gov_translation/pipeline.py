@@ -0,0 +1,86 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from itemadapter import ItemAdapter
+
+from gov_translation.batching import translate_batch
+from gov_translation.glossary import load_glossary
+from gov_translation.memory import translate_sentences
+from gov_translation.planner import is_translatable
+from gov_translation.telemetry import track
+
+
+class TranslationPipeline:
+    """
+    Scrapy item pipeline translating the text fields of items while the crawl runs.
+
+    Enable it in ITEM_PIPELINES ("gov_translation.pipeline.TranslationPipeline") and
+    give the spider translation_source / translation_target, optionally
+    translation_fields (default: every field), skip_translation_columns and
+    translation_sentence_memory (translate long fields sentence by sentence, see
+    memory.translate_sentences). Terms of the site's glossary (see
+    glossary.load_glossary) are answered without the cache or the translator.
+
+    Translations land in the shared cache, so the translation step in the spider's
+    close() reads them from there instead of starting only once the crawl is over.
+    process_item waits for its item, so at most CONCURRENT_ITEMS items per response
+    are in flight and a slow translator slows the scraper down instead of piling
+    up work; TRANSLATION_PIPELINE_WORKERS bounds the translating threads.
+    """
+
+    def __init__(self, crawler=None, workers=16):
+        self.crawler = crawler
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='translation-pipeline')
+        self.items = 0
+        self.cells = 0
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler, crawler.settings.getint('TRANSLATION_PIPELINE_WORKERS', 16))
+
+    def _spider(self, spider):
+        return spider if spider is not None else self.crawler.spider
+
+    async def process_item(self, item, spider=None):
+        spider = self._spider(spider)
+        source_lang = getattr(spider, 'translation_source', None)
+        target_lang = getattr(spider, 'translation_target', 'en')
+        if not source_lang:
+            return item
+
+        adapter = ItemAdapter(item)
+        fields = getattr(spider, 'translation_fields', None) or list(adapter.keys())
+        skip = getattr(spider, 'skip_translation_columns', ())
+        # Cleaned like the spiders' remove_extra_space does before close() translates the table,
+        # so close() asks for the same cells and sentences and finds them in the cache
+        values = [
+            ' '.join(adapter.get(field).split()) for field in fields
+            if field not in skip and is_translatable(adapter.get(field))
+        ]
+        if not values:
+            return item
+
+        sentences = getattr(spider, 'translation_sentence_memory', False)
+        future = self.executor.submit(self._translate, spider.name, values, source_lang, target_lang, sentences)
+        try:
+            await asyncio.wrap_future(future)
+        except Exception as e:
+            # close() translates whatever is still missing
+            print(f"Error translating item fields: {e}")
+        self.items += 1
+        self.cells += len(values)
+        return item
+
+    def _translate(self, spider_name, values, source_lang, target_lang, sentences=False):
+        with track(spider_name, 'pipeline'):
+            # close() looks the same values up again, that is where the glossary misses are counted
+            glossary = load_glossary(spider_name)
+            if glossary is not None:
+                glossary = glossary.silent()
+            if sentences:
+                return translate_sentences({None: values}, source_lang, target_lang, glossary=glossary)[None]
+            return translate_batch(values, source_lang, target_lang, glossary=glossary)
+
+    def close_spider(self, spider=None):
+        self.executor.shutdown(wait=True)
+        print(f"Translated {self.cells} cells of {self.items} items during the crawl")
@@ -0,0 +1,80 @@
+import re
+
+import pandas as pd
+
+# Cell detectors, tried in this order; whatever matches none of them is free text
+DETECTORS = [
+    ('url', re.compile(r'^(?:https?://|www\.)\S+$', re.IGNORECASE)),
+    ('email', re.compile(r'^[^@\s]+@[^@\s]+\.[a-z]{2,}$', re.IGNORECASE)),
+    # 2024-01-31, 31/01/2024, 2024.01.31, 31.01.1980, optionally with a time
+    ('date', re.compile(r'^\d{1,4}[./-]\d{1,2}[./-]\d{1,4}(?:[ T]\d{1,2}:\d{2}(?::\d{2})?\S*)?$')),
+    # 1,234.56  B/. 5,000.00  $ 1.200  S/ 300  12%  1 500 RON
+    ('number', re.compile(r'^[(\s]*(?:B/\.|S/\.?|[A-Z]{0,3}\s?[$€£])?\s*[-+]?\d[\d.,\s]*%?\)?\s*(?:[A-Z]{3}|lei)?$')),
+    # N°045-2024-OEFA, DS-123/2023, AB12345: one token holding at least one digit
+    ('code', re.compile(r'^(?=\S*\d)[\w°º#/.:-]+$')),
+]
+
+EMPTY_VALUES = {'', 'n/a', 'none', 'nan', 'null', '-'}
+
+# Column names that never hold text to translate, whatever their content
+SKIP_COLUMN_NAMES = {'id', 'url', 'link', 'email'}
+SKIP_COLUMN_SUFFIXES = ('_url', '_link', '_id', '_email')
+
+
+def cell_kind(value):
+    """'empty', 'url', 'email', 'date', 'number', 'code' or 'text'."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return 'empty'
+    if not isinstance(value, str):
+        return 'number'
+    value = value.strip()
+    if value.lower() in EMPTY_VALUES:
+        return 'empty'
+    for kind, pattern in DETECTORS:
+        if pattern.match(value):
+            return kind
+    return 'text'
+
+
+def is_translatable(value):
+    return cell_kind(value) == 'text'
+
+
+def classify_column(name, values, threshold=0.8):
+    """
+    Kind of a column: 'text' when it is worth sending to the translator, otherwise
+    the kind most of its non-empty cells have ('url', 'number', ...), or 'empty'.
+    """
+    name = str(name).lower()
+    if name in SKIP_COLUMN_NAMES or name.endswith(SKIP_COLUMN_SUFFIXES):
+        return 'url' if 'url' in name or 'link' in name else 'id'
+    kinds = [kind for kind in map(cell_kind, values) if kind != 'empty']
+    if not kinds:
+        return 'empty'
+    if kinds.count('text') > (1 - threshold) * len(kinds):
+        return 'text'
+    return max(set(kinds), key=kinds.count)
+
+
+def plan_columns(df, translate_columns=(), skip_columns=()):
+    """
+    {column: kind} for every column of df; only 'text' columns get translated.
+    translate_columns / skip_columns are the per-spider overrides.
+    """
+    plan = {}
+    for column in df.columns:
+        if column in skip_columns:
+            plan[column] = 'skip'
+        elif column in translate_columns:
+            plan[column] = 'text'
+        else:
+            plan[column] = classify_column(column, pd.unique(df[column]))
+    return plan
+
+
+def is_translatable_header(name):
+    """Column names are translated like cells, except the ones that are never text (id, url, ...)."""
+    lowered = str(name).lower()
+    if lowered in SKIP_COLUMN_NAMES or lowered.endswith(SKIP_COLUMN_SUFFIXES):
+        return False
+    return is_translatable(name)
@@ -0,0 +1,14 @@
+import gov_translation.client as client_module
+
+
+def connection_stats():
+    """
+    Requests sent and connections opened by the shared translation client.
+    connections_reused is how many requests went out on an already open connection.
+    """
+    stats = {'requests': 0, 'connections_created': 0, 'connections_reused': 0}
+    client = client_module._default_client
+    if client is not None:
+        for key, value in client.connection_stats().items():
+            stats[key] += value
+    return stats
@@ -0,0 +1,139 @@
+import contextvars
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+import pandas as pd
+
+# (spider, column) the translations of the current thread are counted under
+_current_tag = contextvars.ContextVar('translation_tag', default=('N/A', 'N/A'))
+
+REPORT_COLUMNS = [
+    'spider', 'column', 'cells', 'cache_hits', 'cache_misses', 'cache_hit_rate', 'glossary_hits', 'same_language', 'requests', 'chars_sent',
+    'batches', 'mean_batch_size', 'max_batch_size', 'retries', 'throttled', 'errors',
+    'latency_p50', 'latency_p95', 'latency_p99',
+]
+
+
+@contextmanager
+def track(spider=None, column=None):
+    """
+    Count the translations made inside the block under spider / column.
+    A part left to None keeps the value of the enclosing block.
+    """
+    current_spider, current_column = _current_tag.get()
+    token = _current_tag.set((spider or current_spider, column or current_column))
+    try:
+        yield
+    finally:
+        _current_tag.reset(token)
+
+
+def current_tag():
+    return _current_tag.get()
+
+
+class TranslationTelemetry:
+    """
+    Counters and latency samples of the translations, per (spider, column).
+    Written from the spider threads and the client's event loop, hence the lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(lambda: defaultdict(int))
+        self._batch_sizes = defaultdict(list)
+        self._latencies = defaultdict(list)
+
+    def record_cache(self, tag, hits, misses):
+        with self._lock:
+            counters = self._counters[tag]
+            counters['cache_hits'] += hits
+            counters['cache_misses'] += misses
+            counters['cells'] += hits + misses
+
+    def record_glossary(self, tag, hits=1):
+        """Cells answered by the site's glossary, before the cache."""
+        with self._lock:
+            self._counters[tag]['glossary_hits'] += hits
+            self._counters[tag]['cells'] += hits
+
+    def record_same_language(self, tag):
+        """A cell left untouched because it is already in the target language."""
+        with self._lock:
+            self._counters[tag]['same_language'] += 1
+            self._counters[tag]['cells'] += 1
+
+    def record_batch(self, tag, size):
+        with self._lock:
+            self._counters[tag]['batches'] += 1
+            self._batch_sizes[tag].append(size)
+
+    def record_request(self, tag, chars, latency, throttled=False, error=False, retry=False):
+        """One HTTP request to the provider, successful or not."""
+        with self._lock:
+            counters = self._counters[tag]
+            counters['requests'] += 1
+            counters['chars_sent'] += chars
+            counters['throttled'] += throttled
+            counters['errors'] += error
+            counters['retries'] += retry
+            self._latencies[tag].append(latency)
+
+    def summary(self, spider=None):
+        """One row per (spider, column) with the REPORT_COLUMNS."""
+        with self._lock:
+            tags = [tag for tag in self._counters if spider is None or tag[0] == spider]
+            rows = []
+            for tag in sorted(tags):
+                counters = self._counters[tag]
+                batch_sizes = pd.Series(self._batch_sizes[tag], dtype=float)
+                latencies = pd.Series(self._latencies[tag], dtype=float)
+                lookups = counters['cache_hits'] + counters['cache_misses']
+                rows.append({
+                    'spider': tag[0],
+                    'column': tag[1],
+                    'cells': counters['cells'],
+                    'cache_hits': counters['cache_hits'],
+                    'cache_misses': counters['cache_misses'],
+                    'cache_hit_rate': counters['cache_hits'] / lookups if lookups else None,
+                    'glossary_hits': counters['glossary_hits'],
+                    'same_language': counters['same_language'],
+                    'requests': counters['requests'],
+                    'chars_sent': counters['chars_sent'],
+                    'batches': counters['batches'],
+                    'mean_batch_size': batch_sizes.mean() if len(batch_sizes) else None,
+                    'max_batch_size': batch_sizes.max() if len(batch_sizes) else None,
+                    'retries': counters['retries'],
+                    'throttled': counters['throttled'],
+                    'errors': counters['errors'],
+                    'latency_p50': latencies.quantile(0.5) if len(latencies) else None,
+                    'latency_p95': latencies.quantile(0.95) if len(latencies) else None,
+                    'latency_p99': latencies.quantile(0.99) if len(latencies) else None,
+                })
+        return pd.DataFrame(rows, columns=REPORT_COLUMNS)
+
+    def push_to_stats(self, stats, spider):
+        """Copy the spider's rows into Scrapy stats as translation/<column>/<counter>."""
+        for row in self.summary(spider).to_dict('records'):
+            for key, value in row.items():
+                if key in ('spider', 'column') or value is None or pd.isna(value):
+                    continue
+                stats.set_value(f"translation/{row['column']}/{key}", value)
+
+    def write_report(self, filename, spider=None):
+        self.summary(spider).to_excel(filename, index=False)
+        print(f"Translation report saved to {filename}")
+
+    def report_spider(self, spider, filename):
+        """End of run: the spider's counters go to its Scrapy stats and to the report file."""
+        if getattr(spider, 'crawler', None) is not None:
+            self.push_to_stats(spider.crawler.stats, spider.name)
+        self.write_report(filename, spider.name)
+
+
+_default_telemetry = TranslationTelemetry()
+
+
+def default_telemetry():
+    return _default_telemetry
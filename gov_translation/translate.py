@@ -0,0 +1,52 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from gov_translation.cache import default_cache
+from gov_translation.chunking import CHUNK_CHAR_LIMIT, chunk_text
+from gov_translation.client import default_client
+from gov_translation.telemetry import current_tag, track
+
+# Parallel requests used for the chunks of one long text
+CHUNK_WORKERS = 8
+
+
+def cached_translate(text, source_lang, target_lang, translate=None, cache=None):
+    """
+    Translate text through the shared cache: only text never seen before for this
+    language pair reaches the provider. translate defaults to the shared
+    rate limited TranslationClient.
+
+    Text longer than CHUNK_CHAR_LIMIT is split on sentence boundaries, the chunks
+    are translated in parallel (each one cached on its own) and joined in order.
+    """
+    if cache is None:
+        cache = default_cache()
+    # A long text missing from the cache is counted through its chunks
+    translated = cache.get(source_lang, target_lang, text, record_miss=len(text) <= CHUNK_CHAR_LIMIT)
+    if translated is not None:
+        return translated
+
+    if translate is None:
+        def translate(text):
+            return default_client().translate(text, source_lang, target_lang)
+    if len(text) > CHUNK_CHAR_LIMIT:
+        translated = translate_chunks(chunk_text(text), source_lang, target_lang, translate, cache)
+    else:
+        translated = translate(text)
+    if translated is not None:
+        cache.set(source_lang, target_lang, text, translated)
+    return translated
+
+
+def translate_chunks(chunks, source_lang, target_lang, translate, cache):
+    """Translate the chunks of a long text side by side and reassemble them in order."""
+    spider, column = current_tag()
+
+    def translate_chunk(chunk):
+        with track(spider, column):
+            return cached_translate(chunk, source_lang, target_lang, translate, cache)
+
+    with ThreadPoolExecutor(max_workers=min(len(chunks), CHUNK_WORKERS)) as executor:
+        translated = list(executor.map(translate_chunk, chunks))
+    if any(chunk is None for chunk in translated):
+        return None
+    return ' '.join(translated)
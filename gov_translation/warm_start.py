@@ -0,0 +1,151 @@
+"""
+Fill the translation cache from the spreadsheets earlier runs left behind.
+
+Every run writes the scraped table (files/gob_YYYYMMDD.xlsx) and its translation
+(files/translated_gob_YYYYMMDD.xlsx). Their rows are matched by id or url, their
+columns by name (or by the translated name of the header), and every
+(original cell, translated cell) pair is stored in the cache, so a new machine or a
+wiped cache starts hot:
+
+    python -m gov_translation.warm_start                 # every file pair under the repository
+    python -m gov_translation.warm_start path/to/files --dry-run
+"""
+import argparse
+import os
+import re
+from collections import defaultdict
+
+import pandas as pd
+
+from gov_translation.cache import TranslationCache, default_cache, normalize_text
+from gov_translation.glossary import load_glossary, term_key
+from gov_translation.planner import is_translatable
+
+# Scraped file prefix: (spider name, source language, target language, translated file prefix)
+SITES = {
+    'gob': ('wwwgobpe', 'es', 'en', 'translated_gob'),
+    'superseguros': ('superseguros', 'es', 'en', 'translated_superseguros'),
+    'politiaromana': ('gov_politiaromana_ro', 'ro', 'en', 'translated_politiaromana'),
+    'tcontas': ('tcontas', 'pt', 'en', 'new_translated_tcontas'),
+}
+
+SOURCE_FILE = re.compile(r'^(?P<prefix>' + '|'.join(SITES) + r')_(?P<date>\d{8})\.xlsx$')
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _file_name(path):
+    # The spiders build their paths with Windows separators; elsewhere those end up in the file name
+    return os.path.basename(path).replace('\\', '/').rsplit('/', 1)[-1]
+
+
+def find_pairs(paths):
+    """(prefix, date, scraped file, translated file) for every complete pair under paths, oldest first."""
+    pairs = []
+    for path in paths:
+        for directory, _, names in os.walk(path):
+            by_name = {_file_name(name): os.path.join(directory, name) for name in names}
+            for name, full_path in by_name.items():
+                match = SOURCE_FILE.match(name)
+                if not match:
+                    continue
+                prefix, date = match.group('prefix'), match.group('date')
+                translated = by_name.get(f"{SITES[prefix][3]}_{date}.xlsx")
+                if translated is not None:
+                    pairs.append((prefix, date, full_path, translated))
+    return sorted(pairs, key=lambda pair: pair[1])
+
+
+def _read(path):
+    # Older translated files carry headers like ' title', ' url' (and cells with the same leading space)
+    return pd.read_excel(path).rename(columns=lambda column: str(column).strip())
+
+
+def _row_key(source_df, translated_df):
+    for key in ('id', 'url'):
+        if key in source_df.columns and key in translated_df.columns \
+                and source_df[key].is_unique and translated_df[key].is_unique:
+            return key
+    return None
+
+
+def map_columns(source_df, translated_df, source_lang, target_lang, cache, glossary=None):
+    """
+    {scraped column: translated column}. Headers are compared by term_key (case, accents,
+    spaces and underscores aside); renamed ones are found through the glossary or the cache.
+    """
+    translated_columns = {term_key(str(column)): column for column in translated_df.columns}
+    mapping = {}
+    for column in source_df.columns:
+        candidates = [column]
+        if isinstance(column, str):
+            if glossary is not None:
+                candidates.append(glossary.exact.get(column))
+            candidates.append(cache.get(source_lang, target_lang, column))
+        for candidate in candidates:
+            if candidate is not None and term_key(str(candidate)) in translated_columns:
+                mapping[column] = translated_columns[term_key(str(candidate))]
+                break
+    return mapping
+
+
+def aligned_pairs(source_df, translated_df, column_map):
+    """(original, translation) for the cells of the same row and column that were actually translated."""
+    key = _row_key(source_df, translated_df)
+    if key is not None:
+        source_df = source_df.set_index(key)
+        translated_df = translated_df.set_index(key)
+        rows = source_df.index.intersection(translated_df.index)
+        source_df, translated_df = source_df.loc[rows], translated_df.loc[rows]
+    elif len(source_df) != len(translated_df):
+        return []
+    else:
+        source_df, translated_df = source_df.reset_index(drop=True), translated_df.reset_index(drop=True)
+
+    pairs = []
+    for column, translated_column in column_map.items():
+        if column == key:
+            continue
+        for original, translation in zip(source_df[column].tolist(), translated_df[translated_column].tolist()):
+            if not is_translatable(original) or not is_translatable(translation):
+                continue
+            if normalize_text(original) == normalize_text(translation):
+                continue
+            pairs.append((original, translation.strip()))
+    return pairs
+
+
+def warm_start(paths, cache=None, dry_run=False):
+    """Load every file pair under paths into the cache; returns the number of translations stored."""
+    if cache is None:
+        cache = default_cache()
+    translations = defaultdict(dict)
+    for prefix, date, source_path, translated_path in find_pairs(paths):
+        spider_name, source_lang, target_lang, _ = SITES[prefix]
+        source_df = _read(source_path)
+        translated_df = _read(translated_path)
+        column_map = map_columns(source_df, translated_df, source_lang, target_lang, cache, load_glossary(spider_name))
+        pairs = aligned_pairs(source_df, translated_df, column_map)
+        print(f"{_file_name(source_path)}: {len(column_map)} columns aligned, {len(pairs)} translated cells")
+        # Files are read oldest first, so the latest translation of a text wins
+        translations[(source_lang, target_lang)].update(pairs)
+
+    stored = 0
+    for (source_lang, target_lang), pairs in translations.items():
+        print(f"{source_lang} -> {target_lang}: {len(pairs)} distinct translations")
+        if not dry_run:
+            cache.set_many(source_lang, target_lang, pairs.items())
+        stored += len(pairs)
+    return stored
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Fill the translation cache from earlier scraped/translated files")
+    parser.add_argument('paths', nargs='*', default=[REPO_ROOT], help="directories searched for file pairs")
+    parser.add_argument('--cache', help="cache file (default: the shared translation_cache.sqlite)")
+    parser.add_argument('--dry-run', action='store_true', help="only report what would be stored")
+    args = parser.parse_args()
+
+    cache = TranslationCache(args.cache) if args.cache else default_cache()
+    stored = warm_start(args.paths, cache, args.dry_run)
+    print(f"{stored} translations {'found' if args.dry_run else 'stored'}, {len(cache)} entries in the cache")
@@ -1,16 +1,21 @@
 import json
 import os
-import time
+import sys
+from pathlib import Path
 from typing import Union, Iterable
 import pandas as pd
-import requests
 import scrapy
 from scrapy import Spider, Request
 from scrapy.cmdline import execute
 from parsel import Selector
 from datetime import datetime
-from deep_translator import GoogleTranslator
-from concurrent.futures import ThreadPoolExecutor
+
+# The shared gov_translation package lives at the repository root
+sys.path.append(str(Path(__file__).resolve().parents[4]))
+from gov_translation import (
+    cached_translate, connection_stats, default_telemetry, is_translatable, parse_date, plan_columns, track,
+    translate_frame, translate_sentences,
+)
 
 from twisted.internet.defer import Deferred
 
@@ -61,7 +66,7 @@ def translate_text(text, source_lang, target_lang):
         # Skip translation for NaN or empty values
         if pd.isna(text) or text == "":
             return text
-        date = GoogleTranslator(source=source_lang, target=target_lang).translate(text)
+        date = cached_translate(text, source_lang, target_lang)
         # params = {
         #     'sl': 'auto',
         #     'tl': 'en',
@@ -81,41 +86,41 @@ def translate_text(text, source_lang, target_lang):
         return text  # Return the original text in case of error
 
 
-def translate_dataframe(df, source_lang, target_lang, max_workers=5):
+def translate_dataframe(df, source_lang, target_lang, translate_columns=(), skip_columns=()):
     """
-    Translate all rows and columns in a DataFrame using multithreading.
+    Translate the free-text columns of a DataFrame through the shared translation client.
+    Urls, ids, dates, numbers and codes are left as they are (see gov_translation.planner);
+    translate_columns / skip_columns force the decision for specific columns.
     """
     translated_data = pd.DataFrame()
-
-    # Translate column names
-    translated_columns = [
-        translate_text(col, source_lang, target_lang) for col in df.columns
-    ]
-    df.columns = translated_columns  # Apply translated column names
-
-    # Multithreading for faster translation of rows
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        for column in df.columns:
-            # Translate each column independently
-            print(f"Translating column: {column}")
-            translated_column = list(executor.map(lambda x: translate_text(x, source_lang, target_lang),
-                df[column]
-            ))
-            translated_data[column] = translated_column
+    plan = plan_columns(df, translate_columns, skip_columns)
+    # Column names are the spider's own English keys, they are not translated
+
+    # Requests go to the shared translation client, which sets the concurrency from the provider's throttling
+    text_columns = [column for column in df.columns if plan[column] == 'text']
+    print(f"Translating columns: {text_columns}")
+    # The distinct text values of all the columns are packed into requests and queued together,
+    # longest first, so no column waits for another one to finish. The OEFA news repeat the same
+    # sentences, which are looked up one by one in the translation memory.
+    translated = translate_frame(
+        df, text_columns,
+        translatable=is_translatable,
+        translate_many=lambda values: translate_sentences(
+            values, source_lang, target_lang,
+            fallback=lambda x: translate_text(x, source_lang, target_lang),
+        ),
+    )
+    for column in df.columns:
+        if plan[column] != 'text':
+            print(f"Skipping column: {column} ({plan[column]})")
+            translated_data[column] = df[column].tolist()
+        else:
+            translated_data[column] = translated[column]
 
     return translated_data
 
 def date_extractor(text: str):
-    try:
-        text = text.split('-')[0].strip()
-        date = datetime.strptime(text, '%B %d, %Y').strftime('%Y-%m-%d')
-    except:
-        try:
-            text = text.split('-')[0].strip()
-            date = datetime.strptime(text, '%d %B %Y').strftime('%Y-%m-%d')
-        except:
-            date = 'N/A'
-    return date
+    return parse_date(text) or 'N/A'
 
 class WwwgobpeSpider(scrapy.Spider):
     name = "wwwgobpe"
@@ -138,38 +143,6 @@ class WwwgobpeSpider(scrapy.Spider):
         "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
     }
 
-    gtrans_headers = {
-        'accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-        'accept-language': 'en-US,en;q=0.9,tr;q=0.8',
-        'cache-control': 'no-cache',
-        # 'cookie': 'SID=g.a000qgiE86cf_U8KuoN--kRfyGgj5e43jRGX8cJiAmoXnaEBL_ECSyzexV433Yv6MecacKkfsQACgYKAZMSARASFQHGX2Mi9x0D4EiJ3Xbqpi6XD83CEBoVAUF8yKq023dV85gPXppFIFdapnmM0076; __Secure-1PSID=g.a000qgiE86cf_U8KuoN--kRfyGgj5e43jRGX8cJiAmoXnaEBL_ECyg2R0C5kppdjciJAJ9-gFQACgYKAfISARASFQHGX2MiP6rDWyzw7aqaZpyOTPdbPRoVAUF8yKomuo7DrXKXgzqJgh4coOM70076; __Secure-3PSID=g.a000qgiE86cf_U8KuoN--kRfyGgj5e43jRGX8cJiAmoXnaEBL_ECqMEY5u4-tLn84Lv61_N74QACgYKAZgSARASFQHGX2MiwPQb0wjs9MC4c5KqJO00_BoVAUF8yKo-iURgwIzymWu4S7BjQNAA0076; HSID=Akfbc5PYN9P2V3c7d; SSID=A6dj94qEYtFLyaoyQ; APISID=BKPFhwlGmmdwwwK-/AuiXcEDG4M2gDHbYy; SAPISID=ElfTRU8GxnrF7Apo/AvufrDzlNgmcUylHr; __Secure-1PAPISID=ElfTRU8GxnrF7Apo/AvufrDzlNgmcUylHr; __Secure-3PAPISID=ElfTRU8GxnrF7Apo/AvufrDzlNgmcUylHr; SEARCH_SAMESITE=CgQI15wB; __Secure-ENID=24.SE=ZrjRl9yj4BoEFKOnsUM_myXdXzcaZ1H_EIGA7AA9CH6DXOi_TKBEVXkjqx5lzurZGUZyNS8wLBAxPIDut3WT3-fffSjH2MT7lAz8gw1ZSMmnmjtNrzMLkJaLlUTHV8c6c4IGtmpGLcS3Ge2c3bvQdvLYBzye4Vao4ZfpxheYYH5qXYR2TKKa3j8ajkM-zRSNgrpCw3Gde55qrSWDDpk4qOntcdKKIMXfd6EQhPjOsXYh_W_GPpfdOiJxYiWYEKbeGJqtFMxGzhqKpSfivbcQYB1w3_tlWD5nsAmesOf61xUqUSJC7QwjpXb3K4i5R1W1-kEuPDieDIaZE4Nsjtwj7VDlQEuvsDjAYEJpKT-ZuILwTHw4S4nt5fg; AEC=AZ6Zc-VVtOfvqbh_n35kiuMHJ2jbhCb3hhr1eHm_KQFRe2yX7CwULMMYIfc; OTZ=7847333_34_34__34_; NID=519=F6D3riUC5AN7VNFCEQTmwMGP4QZk36steLkSDW2_cdmPl8BGhPbzORegOgNJHiQJCZCkS4ycmeXO-4cUzR-bmJiAWMamrcTdKmpTQ_d55gL8kFaTSax769gyRC8NUFzl5bmiHvVdAXm7lGPk-wJqDWvKlS2x8ZA-7sHZU0VmNIoyYyZqVAuISo-fgfui6ZpQnmk6CRSSjHUXQlUzvEXOuaM_JVGo7vVGefOkg8jmYLMfy4GKcbHtDGANBnzjB6iZy523X4cGzzC1RxDAOCvigXmPDB4mnCwCqNGhbW9ekMKeTvEVdrK9LcvCCUgfAALQ2ZGwqt0sWo_XuMWb_mNN3JBQDJMNs5S1vKhhsY1R1Bw6BL2EOc9sTu6Pc6k05bEUMHzjK2O8iO1yjgk31M2ZtVCcL1MXWxrenBxwQryLS0VVVXyqtUiqO6_WZgFqXoIGrxeUV_-ToxktZb1zHgILePrLRbRsE72lBXoX9e-BydMpm91J3vIo2Gqp00ase02H1YNago9GGC7C5mcsh2p5kkb1N-HdORVkOZBqkDBcfjj3ONsdGWg9fxh1P1HZy26CR7qyDOa9shkartMfJ7L0ICriObzOh_ln4mIOyQ2KXWhGmH5Uv77OmS12ienDPSLys6E_BRGF2dW3iWcIOKksIhZ8jckya6eiIiZHa-TFsAhQni2d_rWEvY1jfyX70d0yfmtILIq2tskvecXoQVbM9dMML65zgcOsbV3fxrhiDSfLSYkaW9W04TkXHbDH-f0HKoB-Ci1OGZca52Txrpj2qdHvVQ; __Secure-1PSIDTS=sidts-CjEBQT4rX-pEUHgJw6U2xuPjj5PlYYtX-sndvcgJGHw3_sc9fvm7QXSPjOxJipd_zZquEAA; __Secure-3PSIDTS=sidts-CjEBQT4rX-pEUHgJw6U2xuPjj5PlYYtX-sndvcgJGHw3_sc9fvm7QXSPjOxJipd_zZquEAA; SIDCC=AKEyXzWW8y-5uWrM0VcCN0e6nGNgdhaC1LXfUXIQK1ilUNDhJeywBBjETJwRBrdAQM0K8vz15A; __Secure-1PSIDCC=AKEyXzXeRPU_m1The1I2UlWm0gkWWhdpYH_3Fx5YdyD9J1jnI8KS0rmzeKj6UanYAMixx6ri1Q; __Secure-3PSIDCC=AKEyXzUU6eRR-YjSHPSRS0hYbydpATGLurkudC4_7xzcJumljV2SEjTI23EyHhhHJum_WUfH6RU',
-        'pragma': 'no-cache',
-        'priority': 'u=0, i',
-        'referer': 'https://translate.google.com/m',
-        'sec-ch-ua': '"Google Chrome";v="131", "Chromium";v="131", "Not_A Brand";v="24"',
-        'sec-ch-ua-arch': '"x86"',
-        'sec-ch-ua-bitness': '"64"',
-        'sec-ch-ua-form-factors': '"Desktop"',
-        'sec-ch-ua-full-version': '"131.0.6778.86"',
-        'sec-ch-ua-full-version-list': '"Google Chrome";v="131.0.6778.86", "Chromium";v="131.0.6778.86", "Not_A Brand";v="24.0.0.0"',
-        'sec-ch-ua-mobile': '?0',
-        'sec-ch-ua-model': '""',
-        'sec-ch-ua-platform': '"Windows"',
-        'sec-ch-ua-platform-version': '"10.0.0"',
-        'sec-ch-ua-wow64': '?0',
-        'sec-fetch-dest': 'document',
-        'sec-fetch-mode': 'navigate',
-        'sec-fetch-site': 'same-origin',
-        'sec-fetch-user': '?1',
-        'upgrade-insecure-requests': '1',
-        'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
-        'x-browser-channel': 'stable',
-        'x-browser-copyright': 'Copyright 2024 Google LLC. All rights reserved.',
-        'x-browser-validation': 'Nbt54E7jcg8lQ4EExJrU2ugNG6o=',
-        'x-browser-year': '2024',
-        'x-client-data': 'CIq2yQEIo7bJAQiKksoBCKmdygEIn5XLAQiUocsBCPaYzQEIhaDNAQj9pc4BCNWszgEI6rzOAQj9yc4BCMbPzgEIrtDOAQji0M4BCJzSzgEIi9POAQiy084B',
-    }
-
     cookies = {
         '_ga': 'GA1.1.1510528277.1732859778',
         '_clck': '1a67gpb%7C2%7Cfrg%7C0%7C1794',
@@ -181,6 +154,12 @@ class WwwgobpeSpider(scrapy.Spider):
 
 
     main_lis = []
+
+    # Used by gov_translation.pipeline.TranslationPipeline while crawling and by close()
+    translation_source = "es"  # The site is in Spanish
+    translation_target = "en"
+    translation_fields = ["title", "description"]
+    translation_sentence_memory = True
     def start_requests(self):
         for posi in range(1, 11):
             url = f'https://www.gob.pe/busquedas.json?contenido=noticias&institucion=oefa&sheet={posi}&sort_by=none&term=Sanction'
@@ -209,22 +188,8 @@ class WwwgobpeSpider(scrapy.Spider):
 
 
         main_dic = {}
-        date = kwargs['date']
-        params = {
-            'sl': 'auto',
-            'tl': 'en',
-            'hl': 'en',
-            'q': date,
-        }
-
-        # print(date)
-        res = requests.get('https://translate.google.com/m',
-                                params=params,
-                                headers=self.gtrans_headers
-                                )
-        selector = Selector(res.text)
-        date = selector.xpath('//div[@class="result-container"]//text()').get()
-        # print(date)
+        # Spanish publication date parsed locally, the callback makes no blocking request
+        date = parse_date(kwargs['date']) or 'N/A'
         selector = Selector(response.text)
         title = selector.xpath('//h1[@class="text-3xl md:text-4xl leading-9 font-extrabold"]//text()').get()
 
@@ -235,6 +200,7 @@ class WwwgobpeSpider(scrapy.Spider):
         main_dic['description'] = description
 
         self.main_lis.append(main_dic)
+        yield main_dic
 
     def close(self, spider: Spider, reason: str):
         if not os.path.exists('files'):
@@ -262,9 +228,14 @@ class WwwgobpeSpider(scrapy.Spider):
         input_file_path = os.getcwd() + f"\\files\\gob_{datetime.now().strftime('%Y%m%d')}.xlsx"
         df.to_excel(input_file_path, index=False)
 
-        source_language = "pe"  # Detect language peru
-        target_language = "en"
-        translated_df = translate_dataframe(df, source_language, target_language, max_workers=10)
+        source_language = self.translation_source
+        target_language = self.translation_target
+        with track(self.name):
+            translated_df = translate_dataframe(df, source_language, target_language)
+        print(f"Translation connections: {connection_stats()}")
+        default_telemetry().report_spider(
+            self, os.getcwd() + f"\\files\\translation_report_{self.name}_{datetime.now().strftime('%Y%m%d')}.xlsx"
+        )
 
         translated_df['title'] = remove_extra_space(translated_df['title'])
         translated_df['description'] = remove_extra_space(translated_df['description'])
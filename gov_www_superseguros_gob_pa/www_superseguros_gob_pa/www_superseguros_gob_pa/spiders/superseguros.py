@@ -1,4 +1,6 @@
 import os
+import sys
+from pathlib import Path
 from typing import Union
 import pandas as pd
 import scrapy
@@ -7,8 +9,15 @@ from scrapy.cmdline import execute
 from parsel import Selector
 from datetime import datetime
 from io import StringIO
-from deep_translator import GoogleTranslator
-from concurrent.futures import ThreadPoolExecutor
+
+# The shared gov_translation package lives at the repository root
+sys.path.append(str(Path(__file__).resolve().parents[4]))
+# Aliased: translate_dataframe's translate_columns argument is the planner override
+from gov_translation import translate_columns as translate_column_values
+from gov_translation import (
+    cached_translate, connection_stats, default_telemetry, is_translatable, is_translatable_header, plan_columns,
+    load_glossary, track, translate_frame,
+)
 
 
 def remove_extra_space(column):
@@ -26,33 +35,54 @@ def translate_text(text, source_lang, target_lang):
         # Skip translation for NaN or empty values
         if pd.isna(text) or text == "":
             return text
-        return GoogleTranslator(source=source_lang, target=target_lang).translate(text)
+        return cached_translate(text, source_lang, target_lang)
     except Exception as e:
         print(f"Error translating '{text}': {e}")
         return text  # Return the original text in case of error
 
 
-def translate_dataframe(df, source_lang, target_lang, max_workers=5):
+def translate_dataframe(df, source_lang, target_lang, translate_columns=(), skip_columns=(), glossary=None):
     """
-    Translate all rows and columns in a DataFrame using multithreading.
+    Translate the free-text columns of a DataFrame through the shared translation client.
+    Urls, ids, dates, numbers and codes are left as they are (see gov_translation.planner);
+    translate_columns / skip_columns force the decision for specific columns.
+    Column names and cells found in glossary never reach the cache or the translator.
     """
     translated_data = pd.DataFrame()
-
-    # Translate column names
-    translated_columns = [
-        translate_text(col, source_lang, target_lang) for col in df.columns
-    ]
+    plan = plan_columns(df, translate_columns, skip_columns)
+
+    # Translate column names; the glossary knows them, the others go through the cache
+    with track(column='headers'):
+        translated_columns = []
+        for col in df.columns:
+            if not is_translatable_header(col):
+                translated_columns.append(col)
+                continue
+            translated = glossary.lookup(col) if glossary is not None else None
+            translated_columns.append(translated or translate_text(col, source_lang, target_lang))
+    plan = dict(zip(translated_columns, plan.values()))
     df.columns = translated_columns  # Apply translated column names
 
-    # Multithreading for faster translation of rows
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        for column in df.columns:
-            # Translate each column independently
-            print(f"Translating column: {column}")
-            translated_column = list(executor.map(lambda x: translate_text(x, source_lang, target_lang),
-                df[column]
-            ))
-            translated_data[column] = translated_column
+    # Requests go to the shared translation client, which sets the concurrency from the provider's throttling
+    text_columns = [column for column in df.columns if plan[column] == 'text']
+    print(f"Translating columns: {text_columns}")
+    # The distinct text values of all the columns are packed into requests and queued together,
+    # longest first, so no column waits for another one to finish
+    translated = translate_frame(
+        df, text_columns,
+        translatable=is_translatable,
+        glossary=glossary,
+        translate_many=lambda values: translate_column_values(
+            values, source_lang, target_lang,
+            fallback=lambda x: translate_text(x, source_lang, target_lang),
+        ),
+    )
+    for column in df.columns:
+        if plan[column] != 'text':
+            print(f"Skipping column: {column} ({plan[column]})")
+            translated_data[column] = df[column].tolist()
+        else:
+            translated_data[column] = translated[column]
 
     return translated_data
 
@@ -123,7 +153,17 @@ class SupersegurosSpider(scrapy.Spider):
 
         source_language = "es"  # Detect language spanish
         target_language = "en"
-        translated_df = translate_dataframe(df, source_language, target_language, max_workers=10)
+        glossary = load_glossary(self.name)
+        with track(self.name):
+            translated_df = translate_dataframe(df, source_language, target_language, glossary=glossary)
+        print(f"Translation connections: {connection_stats()}")
+        default_telemetry().report_spider(
+            self, os.getcwd() + f"\\files\\translation_report_{self.name}_{datetime.now().strftime('%Y%m%d')}.xlsx"
+        )
+        if glossary is not None:
+            glossary.write_misses(
+                os.getcwd() + f"\\files\\glossary_misses_{self.name}_{datetime.now().strftime('%Y%m%d')}.xlsx"
+            )
 
         translated_df = translated_df.replace('', 'N/A').replace('None', 'N/A')  # Replace empty strings
         translated_df.fillna('N/A', inplace=True)  # Replace None or NaN with 'N/A'
@@ -62,9 +62,10 @@ CONCURRENT_REQUESTS = 16
 
 # Configure item pipelines
 # See https://docs.scrapy.org/en/latest/topics/item-pipeline.html
-#ITEM_PIPELINES = {
-#    "politiaromana_ro.pipelines.PolitiaromanaRoPipeline": 300,
-#}
+# Translate items while crawling, see gov_translation/pipeline.py
+ITEM_PIPELINES = {
+    "gov_translation.pipeline.TranslationPipeline": 300,
+}
 
 # Enable and configure the AutoThrottle extension (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/autothrottle.html
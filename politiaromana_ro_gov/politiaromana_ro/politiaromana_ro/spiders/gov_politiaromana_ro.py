@@ -1,12 +1,21 @@
 import os
+import sys
+from pathlib import Path
 import pandas as pd
 import scrapy
 from scrapy.cmdline import execute
 from parsel import Selector
 import re
 from datetime import datetime
-from deep_translator import GoogleTranslator
-from concurrent.futures import ThreadPoolExecutor
+
+# The shared gov_translation package lives at the repository root
+sys.path.append(str(Path(__file__).resolve().parents[4]))
+# Aliased: translate_dataframe's translate_columns argument is the planner override
+from gov_translation import translate_columns as translate_column_values
+from gov_translation import (
+    cached_translate, connection_stats, default_telemetry, is_translatable, plan_columns, track,
+    translate_frame,
+)
 
 def remove_extra_space(row_data):
     # Remove any extra spaces or newlines created by this replacement
@@ -23,28 +32,40 @@ def translate_text(text, source_lang, target_lang):
         # Skip translation for NaN or empty values
         if pd.isna(text) or text == "":
             return text
-        return GoogleTranslator(source=source_lang, target=target_lang).translate(text)
+        return cached_translate(text, source_lang, target_lang)
     except Exception as e:
         print(f"Error translating '{text}': {e}")
         return text  # Return the original text in case of error
 
 
-def translate_dataframe(df, source_lang, target_lang, max_workers=5):
+def translate_dataframe(df, source_lang, target_lang, translate_columns=(), skip_columns=()):
     """
-    Translate all rows and columns in a DataFrame using multithreading.
+    Translate the free-text columns of a DataFrame through the shared translation client.
+    Urls, ids, dates, numbers and codes are left as they are (see gov_translation.planner);
+    translate_columns / skip_columns force the decision for specific columns.
     """
     translated_data = pd.DataFrame()
-
-    # Multithreading for faster translation
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        for column in df.columns:
-            # Translate each column independently
-            print(f"Translating column: {column}")
-            translated_column = list(executor.map(
-                lambda x: translate_text(x, source_lang, target_lang),
-                df[column]
-            ))
-            translated_data[column] = translated_column
+    plan = plan_columns(df, translate_columns, skip_columns)
+
+    # Requests go to the shared translation client, which sets the concurrency from the provider's throttling
+    text_columns = [column for column in df.columns if plan[column] == 'text']
+    print(f"Translating columns: {text_columns}")
+    # The distinct text values of all the columns are packed into requests and queued together,
+    # longest first, so no column waits for another one to finish
+    translated = translate_frame(
+        df, text_columns,
+        translatable=is_translatable,
+        translate_many=lambda values: translate_column_values(
+            values, source_lang, target_lang,
+            fallback=lambda x: translate_text(x, source_lang, target_lang),
+        ),
+    )
+    for column in df.columns:
+        if plan[column] != 'text':
+            print(f"Skipping column: {column} ({plan[column]})")
+            translated_data[column] = df[column].tolist()
+        else:
+            translated_data[column] = translated[column]
 
     return translated_data
 
@@ -138,6 +159,13 @@ class GovPolitiaromanaRoSpider(scrapy.Spider):
 
     indx = 0
 
+    # Used by gov_translation.pipeline.TranslationPipeline while crawling and by close()
+    # The English pages still carry Romanian text; cells already in English are not sent
+    translation_source = "ro"
+    translation_target = "en"
+    # Names of wanted persons are kept exactly as published
+    skip_translation_columns = ['name']
+
     def start_requests(self):
         yield scrapy.Request(
             self.start_urls[0],
@@ -192,6 +220,7 @@ class GovPolitiaromanaRoSpider(scrapy.Spider):
         # main_dict['id'] = self.indx
 
         self.final_data.append(main_dict)
+        yield main_dict
 
     def close(self, spider, reason: str):
         df = pd.DataFrame(self.final_data)
@@ -216,9 +245,16 @@ class GovPolitiaromanaRoSpider(scrapy.Spider):
         # Export the DataFrame to Excel
         df.to_excel(input_file_path, index=False, engine='openpyxl')
 
-        source_language = "auto"  # Detect language automatically
-        target_language = "en"
-        translated_df = translate_dataframe(df, source_language, target_language, max_workers=10)
+        source_language = self.translation_source
+        target_language = self.translation_target
+        with track(self.name):
+            translated_df = translate_dataframe(
+                df, source_language, target_language, skip_columns=self.skip_translation_columns
+            )
+        print(f"Translation connections: {connection_stats()}")
+        default_telemetry().report_spider(
+            self, os.getcwd() + f"\\files\\translation_report_{self.name}_{datetime.now().strftime('%Y%m%d')}.xlsx"
+        )
 
         translated_df = translated_df.replace('', 'N/A').replace('None', 'N/A')  # Replace empty strings
         translated_df.fillna('N/A', inplace=True)  # Replace None or NaN with 'N/A'
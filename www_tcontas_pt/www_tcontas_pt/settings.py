@@ -62,9 +62,10 @@ ROBOTSTXT_OBEY = False
 
 # Configure item pipelines
 # See https://docs.scrapy.org/en/latest/topics/item-pipeline.html
-#ITEM_PIPELINES = {
-#    "www_tcontas_pt.pipelines.WwwTcontasPtPipeline": 300,
-#}
+# Translate items while crawling, see gov_translation/pipeline.py
+ITEM_PIPELINES = {
+    "gov_translation.pipeline.TranslationPipeline": 300,
+}
 
 # Enable and configure the AutoThrottle extension (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/autothrottle.html
@@ -1,10 +1,9 @@
 import json
 import os
-import random
-import time
+import sys
+from pathlib import Path
 from typing import Union, Iterable
 from urllib.parse import urljoin
-import numpy as np
 import pandas as pd
 import requests
 import scrapy
@@ -12,8 +11,13 @@ from scrapy import Spider, Request
 from scrapy.cmdline import execute
 from parsel import Selector
 from datetime import datetime
-from deep_translator import GoogleTranslator
-from concurrent.futures import ThreadPoolExecutor
+
+# The shared gov_translation package lives at the repository root
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from gov_translation import (
+    cached_translate, connection_stats, default_client, default_telemetry, distinct_texts, is_translatable, track,
+    load_glossary, translate_sentences,
+)
 from twisted.internet.defer import Deferred
 
 def remove_extra_space(column):
@@ -23,53 +27,40 @@ def remove_extra_space(column):
     # Update the cleaned value back in row_data
     return column
 
-def translate_text_with_retries(translator, value, max_retries=5):
-    """Translate text with retry mechanism in case of errors."""
-    retries = 0
-    while retries < max_retries:
-        try:
-            # Attempt translation
-            translated_value = translator.translate(text=value,)
-            return translated_value
-        except Exception as e:
-            retries += 1
-            wait_time = random.uniform(a=2, b=5) * retries  # Exponential backoff with some randomness
-            print(f"Error translating '{value}': {e}. Retrying in {wait_time:.2f} seconds (Attempt {retries}/{max_retries})")
-            time.sleep(wait_time)
-    return value  # Return original value if all retries fail
-
-
-def translate_chunk_rows(chunk, translator, columns):
-    """Translate a chunk of rows in the dataframe for specified columns."""
-
-
-    for index, row in chunk.iterrows():
-        for col in columns:
-            if col in chunk.columns:
-                value = row[col]
-                try:
-                    if isinstance(value, str) and value.strip().lower() == 'N/A':
-                        chunk.at[index, col] = 'N/A'
-                    elif isinstance(value, str) and value.strip() != '':
-                        # Translate the value with retries
-                        translated_value = translate_text_with_retries(translator, value)
-                        chunk.at[index, col] = translated_value
-                        print(f"Row {index}, Col '{col}': Translated '{value}' -> '{translated_value}'")
-                except Exception as e:
-                    print(f"Error translating '{value}' in row {index}, column '{col}': {e}")
-                    chunk.at[index, col] = value  # Keep original value if error occurs
-    return chunk
-
-
-def translate_dataframe_in_chunks(df, translator, columns, n_workers=10):
-    """Helper function to translate specified columns in the dataframe using parallel processing."""
-    chunks = np.array_split(df, n_workers)
-    print(f"Dataframe split into {n_workers} chunks for parallel processing.")
-
-    with ThreadPoolExecutor(max_workers=n_workers) as executor:
-        results = list(executor.map(lambda chunk: translate_chunk_rows(chunk, translator, columns), chunks))
-    print("All chunks processed.")
-    return pd.concat(results)
+def translate_text_with_retries(value, source, target, max_retries=5):
+    """Translate text; the shared translation client retries throttled requests and honors Retry-After."""
+    try:
+        return cached_translate(
+            value, source, target,
+            lambda text: default_client().translate(text, source, target, max_retries),
+        )
+    except Exception as e:
+        print(f"Error translating '{value}': {e}")
+        return value  # Return original value if all retries fail
+
+
+def translate_dataframe_in_chunks(df, source, target, columns, glossary=None):
+    """Helper function to translate specified columns in the dataframe through the shared translation client."""
+    # Repeated cells (court names, decision types, ...) are translated once and scattered back
+    # Only free text is sent; 'N/A', dates, numbers and process codes are kept as they are
+    # Decision summaries share their stock sentences, which are translated once through the translation memory
+    # Each column is counted on its own in the translation report
+    columns = [col for col in columns if col in df.columns]
+    values = {col: [value for value in distinct_texts(df, [col]) if is_translatable(value)] for col in columns}
+    print(f"{sum(map(len, values.values()))} distinct values to translate, packed into batched requests.")
+
+    translated = translate_sentences(
+        values, source, target,
+        fallback=lambda value: translate_text_with_retries(value, source, target),
+        glossary=glossary,
+    )
+    print("All batches processed.")
+
+    df = df.copy()
+    for col in columns:
+        translations = dict(zip(values[col], translated[col]))
+        df[col] = df[col].map(lambda value: translations.get(value, value) if isinstance(value, str) else value)
+    return df
 
 def date_extractor(text: str):
     try:
@@ -105,6 +96,47 @@ class TcontasSpider(scrapy.Spider):
 
     main_dic = {}
     main_list = []
+
+    # Used by gov_translation.pipeline.TranslationPipeline while crawling and by close()
+    translation_source = 'pt'
+    translation_target = 'en'
+    translation_fields = ['title', 'information', 'description']
+    translation_sentence_memory = True
+
+    # Optional spider argument: robots/sitemap discovery file written by Check_feasibility
+    # (python main.py --discover), e.g. -a discovery_file=../Check_feasibility/discovery/www.tcontas.pt.json
+    discovery_file = None
+
+    def sitemap_seeds(self):
+        """Decision pages (listings and details) listed in the site's sitemaps, if a discovery file was given."""
+        if not self.discovery_file or not os.path.exists(self.discovery_file):
+            return []
+        with open(self.discovery_file, encoding='utf-8') as f:
+            discovery = json.load(f)
+        return [
+            entry['loc'] for entry in discovery['urls']
+            if '/ProdutosTC/Decisoes/' in entry['loc'] and not entry['loc'].lower().endswith('.pdf')
+        ]
+
+    def start_requests(self):
+        seeds = self.sitemap_seeds()
+        if seeds:
+            # The sitemap already lists the decision pages, no need to walk every yearly listing.
+            # Only detalhe.aspx pages hold decisions; the start page and the yearly listings are
+            # parsed as listings (the dupefilter drops the detail pages they lead to a second time)
+            print(f"Seeding {len(seeds)} decision pages from {self.discovery_file}")
+            for url in seeds:
+                if url in self.start_urls:
+                    callback = self.parse
+                elif 'detalhe.aspx' in url.lower():
+                    callback = self.detailed_data
+                else:
+                    callback = self.yearly_decisions
+                yield scrapy.Request(url, callback=callback)
+        else:
+            for url in self.start_urls:
+                yield scrapy.Request(url, callback=self.parse)
+
     def parse(self, response, **kwargs):
         selector = Selector(response.text)
 
@@ -141,6 +173,7 @@ class TcontasSpider(scrapy.Spider):
                 self.main_dic['information'] = information
                 self.main_dic['description'] = description
                 self.main_list.append(self.main_dic)
+                yield self.main_dic
             else:
                 yield scrapy.Request(
                     url,
@@ -168,6 +201,7 @@ class TcontasSpider(scrapy.Spider):
             self.main_dic['information'] = information
             self.main_dic['description'] = description
             self.main_list.append(self.main_dic)
+            yield self.main_dic
 
     def close(self, spider: Spider, reason: str):
         os.makedirs('files', exist_ok=True)
@@ -188,10 +222,21 @@ class TcontasSpider(scrapy.Spider):
         input_file_path = os.getcwd() + f"\\files\\tcontas_{datetime.now().strftime('%Y%m%d')}.xlsx"
         df.to_excel(input_file_path, index=False)
 
-        columns_to_translate = ["title", "information", 'description']
-        # Perform chunked translation with parallel processing
-        translator = GoogleTranslator(source='pt', target='en')
-        translated_df = translate_dataframe_in_chunks(df, translator, columns_to_translate)
+        columns_to_translate = self.translation_fields
+        # Most values were already translated by the pipeline during the crawl and come from the cache
+        glossary = load_glossary(self.name)
+        with track(self.name):
+            translated_df = translate_dataframe_in_chunks(
+                df, self.translation_source, self.translation_target, columns_to_translate, glossary
+            )
+        print(f"Translation connections: {connection_stats()}")
+        default_telemetry().report_spider(
+            self, os.getcwd() + f"\\files\\translation_report_{self.name}_{datetime.now().strftime('%Y%m%d')}.xlsx"
+        )
+        if glossary is not None:
+            glossary.write_misses(
+                os.getcwd() + f"\\files\\glossary_misses_{self.name}_{datetime.now().strftime('%Y%m%d')}.xlsx"
+            )
 
         df['date'] = remove_extra_space(df['date'])
         df['title'] = remove_extra_space(df['title'])